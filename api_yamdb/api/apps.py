@@ -5,3 +5,6 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'АПИ'
+
+    def ready(self):
+        import api.signals  # noqa: F401
@@ -0,0 +1,161 @@
+"""Массовое создание и обновление произведений."""
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from api.cache import bump_generation
+from api.serializers import TitleBulkSerializer
+from reviews.models import Category, Genre, Title
+
+TitleGenre = Title.genre.through
+
+
+def collect_slugs(items):
+    """Слаги жанров и категорий, упомянутые в пакете."""
+    genre_slugs, category_slugs = set(), set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        genres = item.get('genre')
+        if isinstance(genres, list):
+            genre_slugs.update(
+                str(slug) for slug in genres if isinstance(slug, (str, int))
+            )
+        category = item.get('category')
+        if isinstance(category, (str, int)):
+            category_slugs.add(str(category))
+    return genre_slugs, category_slugs
+
+
+class TitleBulkWriter:
+    '''Проверяет и записывает пакет произведений.
+
+    Жанры, категории и обновляемые произведения загружаются для всего
+    пакета сразу, по одному запросу на вид объектов. Элементы,
+    прошедшие проверку, записываются частями по chunk_size: каждая часть
+    в своей транзакции, через bulk_create/bulk_update и одну вставку
+    связей с жанрами. Элементы с ошибками не записываются.
+    '''
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or settings.TITLE_BULK_CHUNK_SIZE
+
+    def get_context(self, items):
+        genre_slugs, category_slugs = collect_slugs(items)
+        return {
+            'genres': Genre.objects.in_bulk(genre_slugs, field_name='slug'),
+            'categories': Category.objects.in_bulk(
+                category_slugs, field_name='slug'
+            ),
+        }
+
+    def validate(self, items):
+        context = self.get_context(items)
+        serializers = {
+            partial: TitleBulkSerializer(context=context, partial=partial)
+            for partial in (False, True)
+        }
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = serializers[isinstance(item, dict) and 'id' in item]
+            try:
+                valid.append((index, serializer.run_validation(item)))
+            except ValidationError as exc:
+                errors.append(
+                    {'index': index, 'status': 'invalid', 'errors': exc.detail}
+                )
+
+        titles = Title.objects.in_bulk(
+            {data['id'] for _, data in valid if 'id' in data}
+        )
+        checked = []
+        for index, data in valid:
+            if 'id' in data and data['id'] not in titles:
+                errors.append({
+                    'index': index,
+                    'status': 'invalid',
+                    'errors': {'id': ['Произведение не найдено.']},
+                })
+            else:
+                checked.append((index, data))
+        return checked, errors, titles
+
+    def bulk_create(self, titles):
+        Title.objects.bulk_create(titles)
+        if titles and titles[0].pk is None:
+            # Django не получает ключи из bulk_create на SQLite. После
+            # первой вставки транзакция держит блокировку записи, а rowid
+            # выдаются по возрастанию, поэтому последние len(titles)
+            # ключей принадлежат вставленным строкам в том же порядке.
+            pks = list(
+                Title.objects.order_by('-pk').values_list('pk', flat=True)[
+                    :len(titles)
+                ]
+            )
+            for title, pk in zip(titles, reversed(pks)):
+                title.pk = pk
+
+    def write_chunk(self, chunk, titles):
+        created, updated, results = [], {}, []
+        created_genres, updated_genres = [], {}
+        fields = set()
+        for index, data in chunk:
+            data = dict(data)
+            genres = data.pop('genre', None)
+            pk = data.pop('id', None)
+            if pk is None:
+                title = Title(**data)
+                created.append(title)
+                created_genres.append((title, genres))
+            else:
+                title = titles[pk]
+                for field, value in data.items():
+                    setattr(title, field, value)
+                fields.update(data)
+                if genres is not None or 'category' in data:
+                    # bulk-операции не отправляют сигналы моделей.
+                    title.related_stale = True
+                    fields.add('related_stale')
+                updated[pk] = title
+                if genres is not None:
+                    updated_genres[pk] = genres
+            results.append((index, title, pk is None))
+
+        self.bulk_create(created)
+        if updated and fields:
+            Title.objects.bulk_update(updated.values(), fields)
+        if updated_genres:
+            TitleGenre.objects.filter(title_id__in=updated_genres).delete()
+        links = [(title.pk, genres) for title, genres in created_genres]
+        links.extend(updated_genres.items())
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title_id=title_id, genre_id=genre.pk)
+            for title_id, genres in links
+            for genre in genres
+        )
+        return [
+            {
+                'index': index,
+                'status': 'created' if is_new else 'updated',
+                'id': title.pk,
+            }
+            for index, title, is_new in results
+        ]
+
+    def save(self, items):
+        '''Записывает пакет и возвращает результат по каждому элементу.'''
+        valid, errors, titles = self.validate(items)
+        results = errors
+        for start in range(0, len(valid), self.chunk_size):
+            with transaction.atomic():
+                results.extend(self.write_chunk(
+                    valid[start:start + self.chunk_size], titles
+                ))
+        if valid:
+            # bulk-операции не отправляют сигналы моделей.
+            bump_generation(Title)
+        results.sort(key=lambda result: result['index'])
+        counts = {'created': 0, 'updated': 0, 'invalid': 0}
+        for result in results:
+            counts[result['status']] += 1
+        return {**counts, 'results': results}
@@ -0,0 +1,186 @@
+"""Условные GET-запросы и кеш ответов на основе поколений моделей.
+
+Для каждой модели в кеше хранится поколение (generation) - отметка
+времени последнего изменения в наносекундах. Валидатор ответа (ETag и
+Last-Modified) строится из поколений моделей, от которых зависит
+представление, без выборки и сериализации данных. Тот же ETag служит
+ключом кеша отрендеренных ответов: изменение любой модели меняет
+поколение, и старые ключи перестают использоваться без перебора и
+удаления записей - они просто вытесняются из кеша по таймауту.
+
+Часть данных модели может иметь своё поколение: источник (source) -
+это модель или пара (модель, scope), например отзывы одного
+произведения. Тогда изменение одной части не сбрасывает ответы,
+зависящие от остальных.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework.permissions import SAFE_METHODS
+
+GENERATION_KEY = 'generation:{}'
+RESPONSE_KEY = 'response:{}:{}'
+
+
+def get_generation_key(source):
+    """Ключ поколения модели или пары (модель, scope)."""
+    if isinstance(source, tuple):
+        model, scope = source
+        return GENERATION_KEY.format(f'{model._meta.label_lower}:{scope}')
+    return GENERATION_KEY.format(source._meta.label_lower)
+
+
+def get_generations(sources):
+    """Возвращает текущие поколения источников одним обращением к кешу."""
+    keys = [get_generation_key(source) for source in sources]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Счётчик вытеснен или ещё не создан: новое значение по
+            # времени не совпадёт с поколением уже выданных ответов.
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(source):
+    """Инвалидирует все валидаторы и ответы, зависящие от источника.
+
+    Возвращает прежнее и новое поколение.
+    """
+    key = get_generation_key(source)
+    current = cache.get(key, 0)
+    generation = max(time.time_ns(), current + 1)
+    cache.set(key, generation, timeout=None)
+    return current, generation
+
+
+def normalize_query_params(query_params):
+    """Приводит параметры запроса к каноничному виду."""
+    return urlencode(sorted(query_params.lists()), doseq=True)
+
+
+class ConditionalListMixin:
+    '''Миксин условных GET-запросов для действия list.
+
+    В атрибуте cache_models (или в get_cache_models, если источники
+    зависят от URL) перечисляются модели, от которых зависит ответ
+    представления. По их поколениям вычисляются ETag и
+    Last-Modified, и при совпадении с If-None-Match/If-Modified-Since
+    ответ 304 возвращается до выборки данных и работы сериализатора:
+    проверяется только существование объектов из URL.
+    При cache_anonymous_responses анонимные ответы дополнительно
+    кешируются в виде уже отрендеренных байтов.
+    '''
+
+    cache_models = ()
+    cache_anonymous_responses = False
+    cache_timeout = settings.CATALOG_CACHE_TIMEOUT
+
+    def get_cache_models(self):
+        return self.cache_models
+
+    def get_validators(self, request):
+        generations = get_generations(self.get_cache_models())
+        lookup = sorted(self.kwargs.items())
+        material = (
+            f'{self.basename}:{self.action}:{lookup}:{request.user.pk}:'
+            f'{request.accepted_renderer.format}:{generations}:'
+            f'{normalize_query_params(request.query_params)}'
+        )
+        etag = hashlib.sha1(material.encode()).hexdigest()
+        last_modified = max(generations, default=0) // 10 ** 9
+        return etag, last_modified
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        self.validators = None
+        self.response_cache_key = None
+        if request.method not in SAFE_METHODS:
+            return handler(request, *args, **kwargs)
+
+        self.validators = self.get_validators(request)
+        etag, last_modified = self.validators
+        # ETag выдаётся только ответом 200 на тот же адрес при тех же
+        # поколениях, поэтому его совпадение, как и готовый ответ в кеше,
+        # уже доказывает существование объектов из URL.
+        proven = quote_etag(etag) in parse_etags(
+            request.META.get('HTTP_IF_NONE_MATCH', '')
+        )
+        cached = None
+        if self.cache_anonymous_responses and request.user.is_anonymous:
+            key = RESPONSE_KEY.format(request.get_host(), etag)
+            cached = cache.get(key)
+            if cached is None:
+                self.response_cache_key = key
+            proven = proven or cached is not None
+        if not proven:
+            self.check_lookup()
+
+        response = get_conditional_response(
+            request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        return handler(request, *args, **kwargs)
+
+    def check_lookup(self):
+        '''Проверяет, что объекты из URL существуют, до ответа 304.
+
+        Поколения моделей не знают о конкретных объектах, поэтому без
+        этой проверки клиент с валидаторами получил бы 304 и для
+        несуществующего адреса. Объект detail-действия загружается
+        get_object и переиспользуется обработчиком, родителей
+        (произведение, отзыв) загружает get_queryset.
+        '''
+        if (self.lookup_url_kwarg or self.lookup_field) in self.kwargs:
+            self.get_object()
+        else:
+            self.get_queryset()
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        validators = getattr(self, 'validators', None)
+        if validators is None or response.status_code not in (200, 304):
+            return response
+
+        # Ответ 304 несёт те же валидаторы, что и 200 (RFC 7232, 4.1).
+        etag, last_modified = validators
+        response['ETag'] = quote_etag(etag)
+        response['Last-Modified'] = http_date(last_modified)
+        key = getattr(self, 'response_cache_key', None)
+        if key is not None and response.status_code == 200:
+            response.render()
+            cache.set(
+                key,
+                (response.content, response['Content-Type']),
+                self.cache_timeout
+            )
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Миксин условных GET-запросов для действий list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -1,13 +1,45 @@
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import Comment, Review, Title
+from reviews.search import COMMENT_INDEX, REVIEW_INDEX, search_titles
 
 
 class TitleFilter(filters.FilterSet):
     genre = filters.CharFilter(field_name='genre__slug')
     category = filters.CharFilter(field_name='category__slug')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['name', 'year', 'genre', 'category']
+        fields = ['name', 'year', 'genre', 'category', 'search']
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class ReviewSearchFilter(filters.FilterSet):
+    search = filters.CharFilter(method='filter_search')
+    title = filters.NumberFilter(field_name='title')
+    author = filters.CharFilter(field_name='author__username')
+
+    class Meta:
+        model = Review
+        fields = ['search', 'title', 'author']
+
+    def filter_search(self, queryset, name, value):
+        return REVIEW_INDEX.search(queryset, value, '-pub_date')
+
+
+class CommentSearchFilter(filters.FilterSet):
+    search = filters.CharFilter(method='filter_search')
+    title = filters.NumberFilter(field_name='review__title')
+    review = filters.NumberFilter(field_name='review')
+    author = filters.CharFilter(field_name='author__username')
+
+    class Meta:
+        model = Comment
+        fields = ['search', 'title', 'review', 'author']
+
+    def filter_search(self, queryset, name, value):
+        return COMMENT_INDEX.search(queryset, value, '-pub_date')
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authentication import ClaimsJWTAuthentication, TokenCache
+from users.models import CustomUser
+from users.tokens import UserAccessToken
+
+
+class WhoAmIView(APIView):
+    """Минимальное представление: только аутентификация и права."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'id': request.user.pk, 'role': request.user.role})
+
+
+class UncachedJWTAuthentication(ClaimsJWTAuthentication):
+    """ClaimsJWTAuthentication без кеша проверенных токенов."""
+
+    token_cache = TokenCache(0)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает число запросов в секунду и время аутентификации '
+            'одного запроса с пользователем из базы (JWTAuthentication), '
+            'из данных токена без кеша токенов и с ним '
+            '(ClaimsJWTAuthentication). Тестовый пользователь создаётся в '
+            'транзакции и откатывается.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def measure(self, authentication_class, token, count):
+        view = WhoAmIView.as_view(
+            authentication_classes=[authentication_class]
+        )
+        factory = APIRequestFactory()
+        request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connection) as context:
+            view(request)
+        started = time.perf_counter()
+        for _ in range(count):
+            view(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        elapsed = time.perf_counter() - started
+
+        authentication = authentication_class()
+        started = time.perf_counter()
+        for _ in range(count):
+            authentication.authenticate(request)
+        overhead = (time.perf_counter() - started) / count * 10 ** 6
+        return count / elapsed, overhead, len(context.captured_queries)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                username='bench-auth', email='bench-auth@yamdb.fake'
+            )
+            token = str(UserAccessToken.for_user(user))
+            ClaimsJWTAuthentication.token_cache.clear()
+            for authentication_class in (JWTAuthentication,
+                                         UncachedJWTAuthentication,
+                                         ClaimsJWTAuthentication):
+                rps, overhead, queries = self.measure(
+                    authentication_class, token, count
+                )
+                self.stdout.write(
+                    f'{authentication_class.__name__}: {rps:.0f} запросов/с, '
+                    f'аутентификация {overhead:.1f} мкс, '
+                    f'{queries} запросов к базе на запрос'
+                )
+            token_cache = ClaimsJWTAuthentication.token_cache
+            self.stdout.write(
+                f'Кеш токенов: {token_cache.hits} попаданий, '
+                f'{token_cache.misses} промахов'
+            )
+
+            transaction.set_rollback(True)
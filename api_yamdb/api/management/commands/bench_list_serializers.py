@@ -0,0 +1,109 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.readers import ReviewReader, TitleReader
+from api.serializers import ReviewSerializer, TitleReaderSerializer
+from api.views import TitleViewSet
+from reviews.models import Category, Genre, Review, Title
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает сериализацию страницы списка через ModelSerializer '
+            'и через читателей строк. Тестовые данные создаются в '
+            'транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int,
+                            default=settings.REST_FRAMEWORK['PAGE_SIZE'])
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def create_data(self, page_size):
+        # bulk_create на SQLite не заполняет pk, поэтому объекты
+        # перечитываются из базы.
+        Category.objects.bulk_create(
+            Category(name=f'Категория {idx}', slug=f'category-{idx}')
+            for idx in range(5)
+        )
+        categories = list(Category.objects.all())
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(10)
+        )
+        genres = list(Genre.objects.all())
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}',
+                year=random.randint(1900, 2020),
+                category=random.choice(categories),
+                description='Описание произведения. ' * 20,
+            )
+            for idx in range(page_size)
+        )
+        titles = list(Title.objects.order_by('id'))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.id, genre_id=genre.id)
+            for title in titles
+            for genre in random.sample(genres, 3)
+        )
+        CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+            for idx in range(page_size)
+        )
+        authors = CustomUser.objects.filter(username__startswith='bench')
+        Review.objects.bulk_create(
+            Review(
+                title=titles[0], author=author, score=random.randint(1, 10),
+                text='Текст отзыва. ' * 20
+            )
+            for author in authors
+        )
+        return titles[0]
+
+    def measure(self, serialize, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        serialize()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return statistics.median(timings) * 1000, peak / 1024
+
+    def handle(self, *args, **options):
+        page_size, repeat = options['page_size'], options['repeat']
+        with transaction.atomic():
+            title = self.create_data(page_size)
+            titles = TitleViewSet.queryset.all()
+            reviews = title.reviews.select_related('author')
+            title_reader, review_reader = TitleReader(), ReviewReader()
+            cases = {
+                'titles serializer': lambda: TitleReaderSerializer(
+                    titles.all()[:page_size], many=True
+                ).data,
+                'titles reader': lambda: title_reader.serialize(
+                    title_reader.get_rows(titles)[:page_size]
+                ),
+                'reviews serializer': lambda: ReviewSerializer(
+                    reviews.all()[:page_size], many=True
+                ).data,
+                'reviews reader': lambda: review_reader.serialize(
+                    review_reader.get_rows(reviews)[:page_size]
+                ),
+            }
+            self.stdout.write(f'Страница из {page_size} объектов:')
+            for name, serialize in cases.items():
+                elapsed, peak = self.measure(serialize, repeat)
+                self.stdout.write(
+                    f'{name}: {elapsed:.2f} мс, пик памяти {peak:.0f} КиБ'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,75 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import TitleViewSet
+from reviews.models import Category, Genre
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Измеряет пропускную способность массовой записи произведений '
+            'через /api/v1/titles/bulk/. Тестовые данные создаются в '
+            'транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10_000)
+        parser.add_argument('--format', choices=('json', 'ndjson'),
+                            default='json')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        with transaction.atomic():
+            admin = CustomUser.objects.create(
+                username='bench-admin', email='bench-admin@yamdb.fake',
+                role='admin'
+            )
+            Category.objects.bulk_create(
+                Category(name=f'Категория {idx}', slug=f'category-{idx}')
+                for idx in range(10)
+            )
+            Genre.objects.bulk_create(
+                Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+                for idx in range(30)
+            )
+            items = [
+                {
+                    'name': f'Произведение {idx}',
+                    'year': random.randint(1900, 2020),
+                    'description': 'Описание произведения.',
+                    'category': f'category-{random.randrange(10)}',
+                    'genre': [
+                        f'genre-{genre}'
+                        for genre in random.sample(range(30), 3)
+                    ],
+                }
+                for idx in range(count)
+            ]
+            if options['format'] == 'json':
+                body, content_type = json.dumps(items), 'application/json'
+            else:
+                body = '\n'.join(json.dumps(item) for item in items)
+                content_type = 'application/x-ndjson'
+
+            request = APIRequestFactory().generic(
+                'POST', '/api/v1/titles/bulk/', body,
+                content_type=content_type
+            )
+            force_authenticate(request, user=admin)
+            view = TitleViewSet.as_view(
+                {'post': 'bulk'}, **TitleViewSet.bulk.kwargs
+            )
+            started = time.perf_counter()
+            response = view(request)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Статус {response.status_code}, создано '
+                f'{response.data["created"]} из {count} за {elapsed:.2f} с '
+                f'({count / elapsed:.0f} произведений/с)'
+            )
+
+            transaction.set_rollback(True)
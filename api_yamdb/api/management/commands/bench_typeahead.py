@@ -0,0 +1,58 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.typeahead import PrefixIndex
+
+SYLLABLES = (
+    'ба', 'ве', 'го', 'ду', 'жи', 'зо', 'ка', 'ле', 'ми', 'но', 'пу', 'ра',
+    'си', 'то', 'фе', 'ха', 'це', 'чи', 'шо', 'ю', 'ан', 'ор', 'ус', 'эк',
+)
+
+
+def make_word():
+    return ''.join(random.choices(SYLLABLES, k=random.randint(2, 4)))
+
+
+class Command(BaseCommand):
+    help = ('Измеряет скорость поиска по индексу подсказок в памяти. '
+            'Индекс строится из случайных названий, база не используется.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000)
+        parser.add_argument('--lookups', type=int, default=10_000)
+        parser.add_argument('--limit', type=int, default=10)
+
+    def handle(self, *args, **options):
+        count, limit = options['count'], options['limit']
+        names = [
+            ' '.join(make_word() for _ in range(random.randint(1, 4)))
+            for _ in range(count)
+        ]
+        started = time.perf_counter()
+        index = PrefixIndex(
+            (pk, name, {'id': pk, 'name': name})
+            for pk, name in enumerate(names, start=1)
+        )
+        self.stdout.write(
+            f'Индекс из {count} названий построен за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
+
+        prefixes = [
+            random.choice(random.choice(names).split())[:random.randint(1, 4)]
+            for _ in range(options['lookups'])
+        ]
+        timings = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            index.search(prefix, limit)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        self.stdout.write(
+            f'Поиск: медиана {statistics.median(timings) * 10 ** 6:.1f} мкс, '
+            f'99-й перцентиль '
+            f'{timings[int(len(timings) * 0.99)] * 10 ** 6:.1f} мкс'
+        )
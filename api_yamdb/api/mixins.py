@@ -2,6 +2,7 @@ from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from users.permissions import IsAdminOrReadOnly
@@ -16,3 +17,17 @@ class CategoryGengeMixin(
     filter_backends = [SearchFilter]
     search_fields = ['name']
     lookup_field = 'slug'
+
+
+class ReaderListMixin:
+    """Миксин списка, сериализующий страницу читателем list_reader."""
+
+    list_reader = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.list_reader.get_rows(queryset)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(self.list_reader.serialize(rows))
+        return self.get_paginated_response(self.list_reader.serialize(page))
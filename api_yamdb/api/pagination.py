@@ -0,0 +1,76 @@
+"""Пагинация API с опциональным режимом курсоров."""
+from rest_framework.pagination import (CursorPagination,
+                                       LimitOffsetPagination,
+                                       PageNumberPagination)
+
+
+class OptionalCursorPagination(CursorPagination):
+    '''Пагинация по ключу (keyset), включаемая по запросу клиента.
+
+    По умолчанию работает как fallback_class, чтобы не ломать
+    существующих клиентов. Если в запросе передан параметр
+    `pagination=cursor` или сам курсор, выборка идёт по ключу
+    сортировки: без COUNT(*) и OFFSET, а ответ содержит
+    непрозрачные ссылки next/previous.
+    '''
+
+    fallback_class = PageNumberPagination
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+
+    def __init__(self):
+        self.fallback = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.mode_query_value
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.fallback = None
+            return super().paginate_queryset(queryset, request, view)
+        self.fallback = self.fallback_class()
+        page = self.fallback.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.fallback.display_page_controls
+        return page
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.fallback_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.fallback_class().get_schema_operation_parameters(view)
+            + super().get_schema_operation_parameters(view)
+        )
+
+    def to_html(self):
+        if self.fallback is not None:
+            return self.fallback.to_html()
+        return super().to_html()
+
+
+class TitlePagination(OptionalCursorPagination):
+    """Пагинация произведений, курсор по названию."""
+
+    ordering = ('name', 'id')
+
+
+class PostPagination(OptionalCursorPagination):
+    """Пагинация отзывов и комментариев, курсор по дате публикации."""
+
+    ordering = ('-pub_date', '-id')
+
+
+class UserPagination(OptionalCursorPagination):
+    """Пагинация пользователей, курсор по никнейму."""
+
+    fallback_class = LimitOffsetPagination
+    ordering = ('username',)
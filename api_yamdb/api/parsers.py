@@ -0,0 +1,31 @@
+"""Парсеры тел запросов API."""
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    '''Парсер NDJSON: по одному JSON-объекту в каждой строке.
+
+    Возвращает список объектов, пустые строки пропускаются.
+    '''
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        content = stream.read() if stream is not None else b''
+        for number, line in enumerate(content.splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line.decode(encoding)))
+            except ValueError as exc:
+                raise ParseError(f'Ошибка разбора NDJSON в строке {number}: '
+                                 f'{exc}')
+        return items
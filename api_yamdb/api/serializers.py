@@ -1,8 +1,12 @@
+from operator import attrgetter
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import serializers, validators
-from rest_framework.relations import SlugRelatedField
+from rest_framework.relations import ManyRelatedField, SlugRelatedField
 from rest_framework.serializers import IntegerField
+from rest_framework.settings import api_settings
 
 from reviews.models import (Category, Comment, Genre, Review,
                             Title)
@@ -23,16 +27,27 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         exclude = ('title',)
 
-    def validate(self, attrs):
-        request = self.context['request']
-        if request.method == 'POST':
-            title_id = self.context['view'].kwargs['title_id']
-            if Review.objects.filter(author=request.user,
-                                     title=title_id).exists():
-                raise validators.ValidationError(
+    def create(self, validated_data):
+        '''Создаёт отзыв, полагаясь на ограничение unique_review.
+
+        Проверка exists() перед вставкой стоила бы лишнего запроса и всё
+        равно не защищала бы от одновременных запросов. Нарушение
+        ограничения превращается в такой же ответ 400.
+        '''
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title']
+            ).exists():
+                raise
+            raise validators.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
                     'Нельзя оставлять отзыв дважды на одно и тоже произвдение'
-                )
-        return attrs
+                ]
+            })
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -48,6 +63,24 @@ class CommentSerializer(serializers.ModelSerializer):
         exclude = ('review',)
 
 
+class ReviewSearchSerializer(ReviewSerializer):
+    """Сериализатор найденных отзывов для модераторов."""
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentSearchSerializer(CommentSerializer):
+    """Сериализатор найденных комментариев для модераторов."""
+
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'title', 'review', 'text', 'author', 'pub_date')
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор категории."""
 
@@ -81,10 +114,52 @@ class TitleReaderSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'rating_sum', 'rating_count', 'weighted_rating', 'related_stale'
+        )
         model = Title
 
 
+class SlugListRelatedField(ManyRelatedField):
+    '''Список слагов, который разрешается в объекты одним запросом.
+
+    Стандартный SlugRelatedField(many=True) ищет каждый слаг отдельным
+    запросом. Здесь все слаги выбираются через __in, а для неизвестных
+    возвращается по ошибке на каждый слаг.
+    '''
+
+    def __init__(self, slug_field, queryset, **kwargs):
+        super().__init__(
+            child_relation=SlugRelatedField(
+                slug_field=slug_field, queryset=queryset
+            ),
+            **kwargs
+        )
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        relation = self.child_relation
+        slugs = list(dict.fromkeys(str(slug) for slug in data))
+        objects = {
+            getattr(obj, relation.slug_field): obj
+            for obj in relation.get_queryset().filter(
+                **{f'{relation.slug_field}__in': slugs}
+            )
+        }
+        missing = [slug for slug in slugs if slug not in objects]
+        if missing:
+            raise serializers.ValidationError([
+                relation.error_messages['does_not_exist'].format(
+                    slug_name=relation.slug_field, value=slug
+                )
+                for slug in missing
+            ])
+        return [objects[slug] for slug in slugs]
+
+
 class TitleAdminSerializer(serializers.ModelSerializer):
     """Сериализатор произведения - запись."""
 
@@ -94,9 +169,8 @@ class TitleAdminSerializer(serializers.ModelSerializer):
             MaxValueValidator(settings.CURRENT_YEAR)
         ]
     )
-    genre = SlugRelatedField(
+    genre = SlugListRelatedField(
         slug_field='slug',
-        many=True,
         queryset=Genre.objects.all()
     )
     category = SlugRelatedField(
@@ -108,5 +182,58 @@ class TitleAdminSerializer(serializers.ModelSerializer):
         fields = '__all__'
         model = Title
 
+    def create(self, validated_data):
+        self.saved_genres = validated_data.get('genre')
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        self.saved_genres = validated_data.get('genre')
+        return super().update(instance, validated_data)
+
     def to_representation(self, value):
-        return TitleReaderSerializer(value).data
+        # Ответ на запись строится из жанров, найденных при валидации,
+        # без повторной выборки жанров произведения. Порядок совпадает
+        # с Genre.Meta.ordering, как при выборке из базы.
+        reader = TitleReaderSerializer(value)
+        genres = getattr(self, 'saved_genres', None)
+        if genres is None:
+            return reader.data
+        names = list(reader.fields)
+        genre_field = reader.fields.pop('genre')
+        data = reader.data
+        data['genre'] = genre_field.to_representation(
+            sorted(genres, key=attrgetter('name'))
+        )
+        return {name: data[name] for name in names}
+
+
+class TitleBulkSerializer(TitleAdminSerializer):
+    '''Элемент массовой записи произведений.
+
+    Слаги жанров и категорий ищутся в словарях context['genres'] и
+    context['categories'], загруженных заранее для всего пакета, поэтому
+    проверка элемента не обращается к базе. Элемент с id обновляет
+    существующее произведение.
+    '''
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    genre = serializers.ListField(child=serializers.CharField())
+    category = serializers.CharField()
+
+    def resolve_slugs(self, kind, slugs):
+        objects = self.context[kind]
+        missing = [slug for slug in slugs if slug not in objects]
+        if missing:
+            raise serializers.ValidationError([
+                SlugRelatedField.default_error_messages[
+                    'does_not_exist'
+                ].format(slug_name='slug', value=slug)
+                for slug in missing
+            ])
+        return [objects[slug] for slug in dict.fromkeys(slugs)]
+
+    def validate_genre(self, slugs):
+        return self.resolve_slugs('genres', slugs)
+
+    def validate_category(self, slug):
+        return self.resolve_slugs('categories', [slug])[0]
@@ -0,0 +1,100 @@
+"""Сигналы приложения api."""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import bump_generation
+from api.typeahead import typeahead
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
+from users.models import CustomUser
+from users.serializers import UserSerializer
+
+VERSIONED_MODELS = (Title, Genre, Category, GenreTitle, Review, Comment)
+# Отзывы и комментарии показывают только имя автора.
+USERNAMES = (CustomUser, 'username')
+
+
+def title_posts(title_id):
+    """Поколение отзывов и комментариев одного произведения."""
+    return (Review, f'title:{title_id}')
+
+
+def invalidate_after_commit(model, instance=None, deleted=False):
+    '''Меняет поколение модели после фиксации транзакции.
+
+    Пока транзакция пишущего запроса не зафиксирована, параллельный
+    запрос читает старые строки: с новым поколением он сохранил бы
+    старый ответ под новым ETag. При откате поколение не меняется.
+    Индекс подсказок обновляется здесь же, после смены поколения,
+    чтобы он мог сверить своё поколение с предыдущим.
+    '''
+    def invalidate():
+        old_generation, new_generation = bump_generation(model)
+        if instance is not None:
+            typeahead.apply(
+                instance, deleted, old_generation, new_generation
+            )
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, signal, instance, **kwargs):
+    """Сбрасывает валидаторы и кеш ответов, зависящие от модели."""
+    if sender in VERSIONED_MODELS:
+        invalidate_after_commit(sender, instance, signal is post_delete)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    """Сбрасывает отзывы и комментарии произведения отзыва."""
+    invalidate_after_commit(title_posts(instance.title_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_title_comments(sender, instance, **kwargs):
+    """Сбрасывает отзывы и комментарии произведения комментария."""
+    if Comment.review.is_cached(instance):
+        title_id = instance.review.title_id
+    else:
+        title_id = Review.objects.filter(
+            pk=instance.review_id
+        ).values_list('title_id', flat=True).first()
+    if title_id is not None:
+        invalidate_after_commit(title_posts(title_id))
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_users(sender, signal, instance, created=False,
+                     update_fields=None, **kwargs):
+    '''Сбрасывает ответы, показывающие изменённые поля пользователя.
+
+    Сохранение только служебных полей (код подтверждения, время
+    входа) не видно ни в одном ответе и поколения не меняет. Имя
+    автора в отзывах и комментариях меняется только при смене
+    username, а у нового пользователя постов ещё нет.
+    '''
+    deleted = signal is post_delete
+    if update_fields is not None and not (
+        set(update_fields) & set(UserSerializer.Meta.fields)
+    ):
+        return
+    invalidate_after_commit(sender, instance, deleted)
+    if deleted or not created and (
+        update_fields is None or 'username' in update_fields
+    ):
+        invalidate_after_commit(USERNAMES)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres_cache(sender, instance, action, **kwargs):
+    """Меняет поколение произведений при изменении их жанров."""
+    if action.startswith('post_'):
+        invalidate_after_commit(
+            Title, instance if isinstance(instance, Title) else None
+        )
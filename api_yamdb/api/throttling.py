@@ -0,0 +1,129 @@
+"""Ограничение частоты запросов скользящим окном из двух счётчиков.
+
+Стандартные ограничители DRF хранят в кеше список отметок времени
+каждого запроса и на каждом запросе читают, обрезают и записывают его
+целиком. Здесь на каждое окно длиной duration заводится один счётчик,
+а число запросов за последние duration секунд оценивается по текущему
+и предыдущему счётчикам: предыдущий берётся с долей, которую он ещё
+занимает в скользящем окне. Запрос стоит одно чтение двух ключей и
+одно увеличение счётчика, независимо от лимита.
+
+Лимиты задаются в THROTTLE_RATES по scope ограничителя, счётчики
+хранятся в локальном кеше процесса (см. CACHES).
+"""
+import hashlib
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Базовый ограничитель; ключ задаёт get_cache_key наследника."""
+
+    cache_format = 'throttle:{scope}:{ident}'
+
+    def get_rate(self):
+        return settings.THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, self.elapsed = divmod(now / self.duration, 1)
+        current_key = f'{self.key}:{window:.0f}'
+        previous_key = f'{self.key}:{window - 1:.0f}'
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+        if self.estimate() >= self.num_requests:
+            return False
+
+        # Счётчик нужен, пока окно остаётся текущим или предыдущим.
+        if not self.cache.add(current_key, 1, 2 * self.duration):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, 2 * self.duration)
+        return True
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed) + self.current
+
+    def wait(self):
+        """Секунды до того, как оценка опустится ниже лимита."""
+        if self.current >= self.num_requests:
+            # В следующем окне текущий счётчик станет предыдущим.
+            fraction = 1 - self.elapsed + 1 - (
+                self.num_requests / self.current
+            )
+        else:
+            fraction = 1 - (
+                (self.num_requests - self.current) / self.previous
+            ) - self.elapsed
+        return max(fraction, 0) * self.duration
+
+    def get_ident_key(self, ident):
+        return self.cache_format.format(scope=self.scope, ident=ident)
+
+
+class AuthIPThrottle(SlidingWindowRateThrottle):
+    """Запросы к регистрации и выдаче токена с одного адреса."""
+
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return self.get_ident_key(self.get_ident(request))
+
+
+class IdentityThrottle(SlidingWindowRateThrottle):
+    '''Запросы по одной учётной записи, с любых адресов.
+
+    Учётная запись определяется полем field тела запроса, запросы
+    без этого поля не ограничиваются. В ключ кеша попадает хеш
+    значения: оно приходит от клиента и может быть любой длины.
+    '''
+
+    field = None
+
+    def get_cache_key(self, request, view):
+        if not isinstance(request.data, dict):
+            return None
+        value = request.data.get(self.field)
+        if not isinstance(value, str) or not value:
+            return None
+        return self.get_ident_key(
+            hashlib.sha1(value.casefold().encode()).hexdigest()
+        )
+
+
+class SignupIdentityThrottle(IdentityThrottle):
+    """Письма с кодом на один адрес."""
+
+    scope = 'signup_identity'
+    field = 'email'
+
+
+class TokenIdentityThrottle(IdentityThrottle):
+    """Попытки подобрать код подтверждения одного пользователя."""
+
+    scope = 'token_identity'
+    field = 'username'
+
+
+class PostRateThrottle(SlidingWindowRateThrottle):
+    """Создание отзывов и комментариев одним пользователем."""
+
+    scope = 'posts'
+
+    def get_cache_key(self, request, view):
+        if request.method != 'POST':
+            return None
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.get_ident_key(ident)
@@ -0,0 +1,169 @@
+"""Индекс префиксов в памяти для подсказок при вводе (typeahead).
+
+Для каждого вида объектов (произведения, жанры, категории) хранится
+отсортированный список пар (ключ, pk), где ключ - нормализованное
+название, начиная с каждого его слова. Поиск префикса - это bisect
+по списку и просмотр подряд идущих ключей, без обращения к базе.
+
+Индекс строится при первом обращении и обновляется из сигналов
+моделей. Поколения моделей из api.cache позволяют заметить изменения,
+сделанные другими процессами: такой вид объектов перестраивается
+целиком при следующем запросе.
+"""
+import threading
+from bisect import bisect_left, insort
+
+from api.cache import get_generations
+from reviews.models import Category, Genre, Title
+
+
+def normalize(text):
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+def get_keys(text):
+    """Ключи для поиска по началу любого слова названия."""
+    words = normalize(text).split(' ')
+    return {' '.join(words[idx:]) for idx in range(len(words))}
+
+
+class PrefixIndex:
+    """Отсортированный индекс префиксов одного вида объектов."""
+
+    def __init__(self, items=()):
+        self.lock = threading.Lock()
+        entries, self.payloads, self.keys = [], {}, {}
+        for pk, text, payload in items:
+            self.payloads[pk] = payload
+            self.keys[pk] = get_keys(text)
+            entries.extend((key, pk) for key in self.keys[pk])
+        entries.sort()
+        self.entries = entries
+
+    def add(self, pk, text, payload):
+        with self.lock:
+            self._remove(pk)
+            self.payloads[pk] = payload
+            self.keys[pk] = get_keys(text)
+            for key in self.keys[pk]:
+                insort(self.entries, (key, pk))
+
+    def remove(self, pk):
+        with self.lock:
+            self._remove(pk)
+
+    def _remove(self, pk):
+        for key in self.keys.pop(pk, ()):
+            idx = bisect_left(self.entries, (key, pk))
+            if idx < len(self.entries) and self.entries[idx] == (key, pk):
+                del self.entries[idx]
+        self.payloads.pop(pk, None)
+
+    def search(self, prefix, limit):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        entries, payloads = self.entries, self.payloads
+        found = {}
+        idx = bisect_left(entries, (prefix,))
+        while idx < len(entries) and len(found) < limit:
+            key, pk = entries[idx]
+            if not key.startswith(prefix):
+                break
+            if pk in payloads:
+                found.setdefault(pk, payloads[pk])
+            idx += 1
+        return list(found.values())
+
+
+def title_item(title):
+    return title['id'], title['name'], {
+        'id': title['id'], 'name': title['name'], 'year': title['year']
+    }
+
+
+def slug_item(obj):
+    return obj['id'], obj['name'], {'name': obj['name'], 'slug': obj['slug']}
+
+
+class Typeahead:
+    '''Подсказки по произведениям, жанрам и категориям.
+
+    sources описывает для каждого вида объектов модель, поля для
+    выборки из базы и функцию, превращающую строку в элемент индекса.
+    '''
+
+    sources = {
+        'titles': (Title, ('id', 'name', 'year'), title_item),
+        'genres': (Genre, ('id', 'name', 'slug'), slug_item),
+        'categories': (Category, ('id', 'name', 'slug'), slug_item),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexes = {}
+        self.generations = {}
+
+    def get_kind(self, model):
+        for kind, (source, _, _) in self.sources.items():
+            if source is model:
+                return kind
+        return None
+
+    def build(self, kind, generation):
+        model, fields, make_item = self.sources[kind]
+        rows = model.objects.order_by().values(*fields).iterator()
+        self.indexes[kind] = PrefixIndex(map(make_item, rows))
+        self.generations[kind] = generation
+
+    def refresh(self):
+        """Перестраивает виды объектов, изменённые другими процессами."""
+        models = [model for model, _, _ in self.sources.values()]
+        generations = dict(zip(self.sources, get_generations(models)))
+        stale = [kind for kind, generation in generations.items()
+                 if self.generations.get(kind) != generation]
+        if not stale:
+            return
+        with self.lock:
+            for kind in stale:
+                if self.generations.get(kind) != generations[kind]:
+                    self.build(kind, generations[kind])
+
+    def search(self, prefix, limit):
+        self.refresh()
+        return {
+            kind: self.indexes[kind].search(prefix, limit)
+            for kind in self.sources
+        }
+
+    def apply(self, instance, deleted, old_generation, new_generation):
+        '''Обновляет индекс по сигналу модели.
+
+        Изменение применяется на месте, только если индекс соответствовал
+        поколению модели до этого изменения; иначе вид объектов будет
+        перестроен при следующем запросе. Вызывается после фиксации
+        транзакции (см. api.signals), проверка и изменение идут под той
+        же блокировкой, что и перестройка.
+        '''
+        kind = self.get_kind(type(instance))
+        if kind is None:
+            return
+        _, fields, make_item = self.sources[kind]
+        deferred = instance.get_deferred_fields().intersection(fields)
+        if deferred and not deleted:
+            # Отложенные поля догружаются одним запросом, а не по одному.
+            instance.refresh_from_db(fields=deferred)
+        pk, text, payload = make_item(
+            {field: getattr(instance, field) for field in fields}
+        )
+        with self.lock:
+            if self.generations.get(kind) != old_generation:
+                return
+            if deleted:
+                self.indexes[kind].remove(pk)
+            else:
+                self.indexes[kind].add(pk, text, payload)
+            self.generations[kind] = new_generation
+
+
+typeahead = Typeahead()
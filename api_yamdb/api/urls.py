@@ -2,8 +2,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewViewSet, TitleViewSet)
+from api.views import (CategoryViewSet, CommentSearchViewSet,
+                       CommentViewSet, GenreViewSet, ReviewSearchViewSet,
+                       ReviewViewSet, TitleViewSet, title_typeahead)
 
 app_name = 'api'
 
@@ -21,7 +22,14 @@ v1_router.register(
 v1_router.register('categories', CategoryViewSet, basename='categories')
 v1_router.register('genres', GenreViewSet, basename='genres')
 v1_router.register('titles', TitleViewSet, basename='titles')
+v1_router.register(
+    'search/reviews', ReviewSearchViewSet, basename='search-reviews'
+)
+v1_router.register(
+    'search/comments', CommentSearchViewSet, basename='search-comments'
+)
 
 urlpatterns = [
+    path('v1/typeahead/', title_typeahead, name='typeahead'),
     path('v1/', include(v1_router.urls)),
 ]
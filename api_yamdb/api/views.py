@@ -1,33 +1,83 @@
 """Представления моделей приложения yatube_api в api."""
-from django.db.models import Avg
+import hashlib
+
+from django.conf import settings
+from django.db.models import Sum
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import (AllowAny, IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
+from rest_framework.response import Response
 
-from api.filters import TitleFilter
-from api.mixins import CategoryGengeMixin
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, ReviewSerializer,
+from api.bulk import TitleBulkWriter
+from api.cache import ConditionalGetMixin, ConditionalListMixin
+from api.filters import CommentSearchFilter, ReviewSearchFilter, TitleFilter
+from api.mixins import CategoryGengeMixin, ReaderListMixin
+from api.pagination import PostPagination, TitlePagination
+from api.parsers import NDJSONParser
+from api.readers import CommentReader, ReviewReader, TitleReader
+from api.serializers import (CategorySerializer, CommentSearchSerializer,
+                             CommentSerializer, GenreSerializer,
+                             ReviewSearchSerializer, ReviewSerializer,
                              TitleAdminSerializer, TitleReaderSerializer)
-from reviews.models import Category, Genre, Review, Title
-from users.permissions import IsAdminOrReadOnly, IsStaffOwnerOrReadOnly
+from api.signals import USERNAMES, title_posts
+from api.throttling import PostRateThrottle
+from api.typeahead import typeahead
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment, Genre,
+                            GenreTitle, Review, Title, TitleActivity)
+from reviews.utils import get_activity_since
+from users.permissions import (IsAdmin, IsAdminOrReadOnly,
+                               IsModeratorOrAdmin, IsStaffOwnerOrReadOnly)
+
+
+def get_limit(request, default, maximum):
+    """Параметр limit запроса, ограниченный диапазоном от 1 до maximum."""
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1),
+                   maximum)
+    except ValueError:
+        return default
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, ReaderListMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет для обьектов модели Review."""
 
     serializer_class = ReviewSerializer
+    list_reader = ReviewReader()
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsStaffOwnerOrReadOnly]
+    pagination_class = PostPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    throttle_classes = [PostRateThrottle]
+
+    def get_cache_models(self):
+        return (Title, USERNAMES, title_posts(self.kwargs['title_id']))
 
     def get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, pk=title_id)
+        '''Произведение из URL, загружается один раз за запрос.
+
+        Отзыву нужен только ключ произведения, поэтому остальные поля
+        не выбираются.
+        '''
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title.objects.only('id'), pk=self.kwargs['title_id']
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        if self.action in ('list', 'create'):
+            return self.get_title().reviews.select_related('author')
+        # Отзыв ищется сразу по паре (произведение, отзыв): отдельная
+        # проверка произведения не нужна, чужой отзыв даст 404.
+        return Review.objects.filter(
+            title_id=self.kwargs['title_id']
+        ).select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(
@@ -36,23 +86,43 @@ class ReviewViewSet(viewsets.ModelViewSet):
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, ReaderListMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет для обьектов модели Comment."""
 
     serializer_class = CommentSerializer
+    list_reader = CommentReader()
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsStaffOwnerOrReadOnly]
+    pagination_class = PostPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    throttle_classes = [PostRateThrottle]
+
+    def get_cache_models(self):
+        return (USERNAMES, title_posts(self.kwargs['title_id']))
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs['review_id'],
-            title__id=self.kwargs['title_id'],
-        )
+        '''Отзыв из URL, загружается один раз за запрос.
+
+        Один запрос проверяет и существование отзыва, и его
+        принадлежность произведению из URL.
+        '''
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.only('id', 'title_id'),
+                pk=self.kwargs['review_id'],
+                title__id=self.kwargs['title_id'],
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        if self.action in ('list', 'create'):
+            return self.get_review().comments.select_related('author')
+        # Вся цепочка родителей проверяется запросом самого комментария.
+        return Comment.objects.filter(
+            review_id=self.kwargs['review_id'],
+            review__title_id=self.kwargs['title_id'],
+        ).select_related('author', 'review')
 
     def perform_create(self, serializer):
         serializer.save(
@@ -61,32 +131,229 @@ class CommentViewSet(viewsets.ModelViewSet):
         )
 
 
-class CategoryViewSet(CategoryGengeMixin):
+class CategoryViewSet(ConditionalListMixin, CategoryGengeMixin):
     """Представление модели категории."""
 
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
+    cache_models = (Category,)
+    cache_anonymous_responses = True
 
 
-class GenreViewSet(CategoryGengeMixin):
+class GenreViewSet(ConditionalListMixin, CategoryGengeMixin):
     """Представление модели жанра."""
 
     serializer_class = GenreSerializer
     queryset = Genre.objects.all()
+    cache_models = (Genre,)
+    cache_anonymous_responses = True
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, ReaderListMixin,
+                   viewsets.ModelViewSet):
     """Представление модели произведения. """
 
     http_method_names = ['get', 'head', 'options', 'post', 'patch', 'delete']
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-        'name'
-    )
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('name')
     permission_classes = [IsAuthenticatedOrReadOnly, IsAdminOrReadOnly]
+    pagination_class = TitlePagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
+    list_reader = TitleReader()
+    cache_models = (Title, Genre, Category, GenreTitle, Review)
+    cache_anonymous_responses = True
+
+    def get_queryset(self):
+        if self.action == 'score_distribution':
+            # Распределению нужен только ключ произведения.
+            return Title.objects.only('id')
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReaderSerializer
         return TitleAdminSerializer
+
+    @action(detail=False,
+            methods=['POST'],
+            permission_classes=[IsAuthenticated, IsAdmin],
+            parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        '''Массовое создание и обновление произведений.
+
+        Принимает JSON-массив или NDJSON. Элементы без id создаются,
+        с id - частично обновляются. Возвращает результат по каждому
+        элементу в порядке запроса.
+        '''
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается список произведений.')
+        if len(items) > settings.TITLE_BULK_MAX_ITEMS:
+            raise ValidationError(
+                'За один запрос можно записать не больше '
+                f'{settings.TITLE_BULK_MAX_ITEMS} произведений.'
+            )
+        return Response(
+            TitleBulkWriter().save(items), status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['GET'])
+    def top(self, request):
+        '''Лучшие произведения по байесовскому рейтингу.
+
+        Поддерживает фильтры списка произведений (genre, category и
+        другие) и параметр limit. Произведения без отзывов не выводятся.
+        '''
+        return self.cached_response(self.get_top, request)
+
+    def get_top(self, request):
+        limit = get_limit(
+            request, settings.TOP_TITLES_LIMIT, settings.TOP_TITLES_MAX_LIMIT
+        )
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            rating_count__gt=0
+        ).order_by('-weighted_rating', '-id')[:limit]
+        return Response(
+            self.list_reader.serialize(self.list_reader.get_rows(queryset))
+        )
+
+    @action(detail=False, methods=['GET'])
+    def trending(self, request):
+        '''Произведения с наибольшим числом отзывов за окно window.
+
+        window - один из ключей TRENDING_WINDOWS. Отзывы берутся из
+        часовых счётчиков TitleActivity, без обращения к таблице отзывов.
+        Поддерживает фильтры списка произведений и параметр limit.
+        '''
+        return self.cached_response(self.get_trending, request)
+
+    def get_trending_window(self, request):
+        window = request.query_params.get(
+            'window', settings.TRENDING_DEFAULT_WINDOW
+        )
+        if window not in settings.TRENDING_WINDOWS:
+            raise ValidationError({'window': [
+                'Допустимые окна: '
+                f'{", ".join(settings.TRENDING_WINDOWS)}.'
+            ]})
+        return settings.TRENDING_WINDOWS[window]
+
+    def get_trending(self, request):
+        since = get_activity_since(self.get_trending_window(request))
+        limit = get_limit(
+            request, settings.TOP_TITLES_LIMIT, settings.TOP_TITLES_MAX_LIMIT
+        )
+        titles = self.filter_queryset(Title.objects.all())
+        activity = TitleActivity.objects.filter(
+            bucket__gte=since, title__in=titles.values('pk')
+        ).values('title').annotate(recent=Sum('count')).filter(
+            recent__gt=0
+        ).order_by('-recent', '-title_id')
+        activity = dict(activity.values_list('title', 'recent')[:limit])
+        rows = {
+            row['id']: row for row in self.list_reader.serialize(
+                self.list_reader.get_rows(Title.objects.filter(
+                    pk__in=activity
+                ))
+            )
+        }
+        return Response([
+            {**rows[pk], 'recent_reviews': recent}
+            for pk, recent in activity.items() if pk in rows
+        ])
+
+    def get_validators(self, request):
+        etag, last_modified = super().get_validators(request)
+        if self.action != 'trending':
+            return etag, last_modified
+        # Окно сдвигается каждый час и без новых отзывов.
+        since = get_activity_since(self.get_trending_window(request))
+        etag = hashlib.sha1(f'{etag}:{since}'.encode()).hexdigest()
+        return etag, max(last_modified, int(since.timestamp()))
+
+    @action(detail=True, methods=['GET'])
+    def related(self, request, pk=None):
+        '''Похожие произведения по жанрам и категории.
+
+        Списки заранее рассчитываются командой build_related_titles,
+        поле similarity - коэффициент Жаккара жанров и категории.
+        '''
+        title = get_object_or_404(Title.objects.only('id'), pk=pk)
+        similarity = dict(
+            title.related_titles.order_by(
+                '-similarity', 'related_id'
+            ).values_list('related_id', 'similarity')
+        )
+        rows = {
+            row['id']: row for row in self.list_reader.serialize(
+                self.list_reader.get_rows(Title.objects.filter(
+                    pk__in=similarity
+                ))
+            )
+        }
+        return Response([
+            {**rows[related_id], 'similarity': value}
+            for related_id, value in similarity.items()
+            if related_id in rows
+        ])
+
+    @action(detail=True, methods=['GET'], url_path='score-distribution')
+    def score_distribution(self, request, pk=None):
+        """Число отзывов произведения с каждой оценкой."""
+        return self.cached_response(
+            self.get_score_distribution, request, pk=pk
+        )
+
+    def get_score_distribution(self, request, pk=None):
+        title = self.get_object()
+        counts = dict(title.score_counts.values_list('score', 'count'))
+        return Response({
+            'title': title.pk,
+            'count': sum(counts.values()),
+            'scores': [
+                {'score': score, 'count': counts.get(score, 0)}
+                for score in range(MIN_SCORE, MAX_SCORE + 1)
+            ],
+        })
+
+
+class ReviewSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Полнотекстовый поиск по отзывам для модераторов и админов."""
+
+    serializer_class = ReviewSearchSerializer
+    queryset = Review.objects.select_related('author').order_by('-pub_date')
+    permission_classes = [IsAuthenticated, IsModeratorOrAdmin]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReviewSearchFilter
+
+
+class CommentSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Полнотекстовый поиск по комментариям для модераторов и админов."""
+
+    serializer_class = CommentSearchSerializer
+    queryset = Comment.objects.select_related('author', 'review').order_by(
+        '-pub_date'
+    )
+    permission_classes = [IsAuthenticated, IsModeratorOrAdmin]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = CommentSearchFilter
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def title_typeahead(request):
+    '''API-view функция подсказок при вводе в строку поиска.
+
+    Ожидает параметр q с началом слова и необязательный limit.
+    Возвращает до limit совпадений среди произведений, жанров и
+    категорий из индекса в памяти, без обращения к базе данных.
+    '''
+    limit = get_limit(
+        request, settings.TYPEAHEAD_LIMIT, settings.TYPEAHEAD_MAX_LIMIT
+    )
+    return Response(
+        typeahead.search(request.query_params.get('q', ''), limit),
+        status=status.HTTP_200_OK
+    )
@@ -60,6 +60,12 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -88,7 +94,7 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
@@ -97,6 +103,16 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Лимиты запросов по scope ограничителей из api.throttling: с одного
+# адреса к регистрации и токену, писем на один адрес, попыток ввести
+# код одного пользователя и новых отзывов и комментариев.
+THROTTLE_RATES = {
+    'auth_ip': '30/min',
+    'signup_identity': '5/hour',
+    'token_identity': '10/min',
+    'posts': '30/min',
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -122,6 +138,14 @@ EMAIL_SENDER_ADRESS = 'from@example.com'
 
 EMAIL_MAX_LEN = 254
 
+# Очередь писем: размер пачки команды send_emails, число попыток,
+# пауза перед второй попыткой в секундах (дальше удваивается) и срок,
+# на который обработчик забирает пачку.
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE = 300
+
 USERNAME_MAX_LEN = 150
 
 THE_EARLIEST_YEAR = -3000
@@ -131,3 +155,42 @@ CURRENT_YEAR = datetime.datetime.now().year
 MAX_NAME_LENGTH = 256
 
 CHARACTER_LIMIT = 30
+
+CATALOG_CACHE_TIMEOUT = 300
+
+TYPEAHEAD_LIMIT = 10
+
+TYPEAHEAD_MAX_LIMIT = 50
+
+TITLE_BULK_CHUNK_SIZE = 1000
+
+TITLE_BULK_MAX_ITEMS = 10000
+
+# Байесовский рейтинг: средняя оценка произведения сдвигается к
+# TITLE_RATING_PRIOR_MEAN с весом TITLE_RATING_PRIOR_WEIGHT отзывов.
+TITLE_RATING_PRIOR_MEAN = 6.0
+
+TITLE_RATING_PRIOR_WEIGHT = 5
+
+TOP_TITLES_LIMIT = 10
+
+TOP_TITLES_MAX_LIMIT = 100
+
+# Окна популярности: отзывы считаются по часам, окно округляется до часа.
+TRENDING_WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+}
+
+TRENDING_DEFAULT_WINDOW = '24h'
+
+RELATED_TITLES_LIMIT = 10
+
+# Сколько секунд данные пользователя в кеше подтверждают данные токена.
+# Пока кеш локальный для процесса, изменения роли из другого процесса
+# вступают в силу не позже чем через это время.
+USER_CLAIMS_CACHE_TIMEOUT = 60
+
+# Сколько проверенных токенов хранит в памяти процесса
+# ClaimsJWTAuthentication; 0 отключает кеш.
+TOKEN_CACHE_SIZE = 10000
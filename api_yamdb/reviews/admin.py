@@ -22,7 +22,7 @@ class ReviewAdmin(admin.ModelAdmin):
         'title'
     )
     list_filter = ('author', 'score', 'pub_date')
-    search_fields = ('author',)
+    search_fields = ('text', 'author__username')
 
 
 @admin.register(Comment)
@@ -37,7 +37,7 @@ class CommentAdmin(admin.ModelAdmin):
         'review'
     )
     list_filter = ('author', 'pub_date')
-    search_fields = ('author',)
+    search_fields = ('text', 'author__username')
 
 
 @admin.register(Genre)
@@ -0,0 +1,114 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Category, Genre, Title
+from reviews.related import (find_related, load_features,
+                             rebuild_related_titles)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск похожих произведений через обратный индекс '
+            'признаков с попарным сравнением со всеми произведениями и '
+            'измеряет полный и частичный пересчёт. Тестовые данные '
+            'создаются в транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=20_000)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--sample', type=int, default=200)
+
+    def create_data(self, count, genres, categories):
+        Category.objects.bulk_create(
+            Category(name=f'Категория {idx}', slug=f'category-{idx}')
+            for idx in range(categories)
+        )
+        category_ids = list(Category.objects.values_list('id', flat=True))
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(genres)
+        )
+        genre_ids = list(Genre.objects.values_list('id', flat=True))
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000,
+                  category_id=random.choice(category_ids))
+            for idx in range(count)
+        )
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in random.sample(genre_ids, random.randint(1, 4))
+        )
+        return title_ids, genre_ids
+
+    def compare_all(self, title_id, features, limit):
+        # Попарное сравнение: то, что заменяет произведение матриц
+        # «произведение x признак» в NumPy.
+        own = features[title_id]
+        similarities = [
+            (-len(own & other) / len(own | other), other_id)
+            for other_id, other in features.items() if other_id != title_id
+        ]
+        similarities.sort()
+        return similarities[:limit]
+
+    def measure(self, run, title_ids):
+        timings = []
+        for title_id in title_ids:
+            started = time.perf_counter()
+            run(title_id)
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        limit = settings.RELATED_TITLES_LIMIT
+        with transaction.atomic():
+            title_ids, genre_ids = self.create_data(
+                options['count'], options['genres'], options['categories']
+            )
+            started = time.perf_counter()
+            features, sizes, index = load_features()
+            self.stdout.write(
+                f'Признаки {len(title_ids)} произведений загружены за '
+                f'{(time.perf_counter() - started) * 1000:.0f} мс'
+            )
+            sample = random.sample(title_ids, options['sample'])
+            per_title = {
+                'обратный индекс': lambda title_id: find_related(
+                    title_id, features, sizes, index, limit
+                ),
+                'сравнение со всеми': lambda title_id: self.compare_all(
+                    title_id, features, limit
+                ),
+            }
+            for name, run in per_title.items():
+                elapsed = self.measure(run, sample)
+                self.stdout.write(
+                    f'{name}: {elapsed:.2f} мс на произведение'
+                )
+
+            started = time.perf_counter()
+            rebuild_related_titles(full=True)
+            self.stdout.write(
+                f'полный пересчёт: {time.perf_counter() - started:.1f} с'
+            )
+            changed = Title.objects.get(pk=random.choice(title_ids))
+            own = set(changed.genre.values_list('id', flat=True))
+            changed.genre.add(random.choice(
+                [genre_id for genre_id in genre_ids if genre_id not in own]
+            ))
+            started = time.perf_counter()
+            rebuilt = rebuild_related_titles()
+            self.stdout.write(
+                f'пересчёт после смены жанров одного произведения: '
+                f'{rebuilt} произведений за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+            transaction.set_rollback(True)
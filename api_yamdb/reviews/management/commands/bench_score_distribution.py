@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+from array import array
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from reviews.models import MAX_SCORE, Review, Title, TitleScore
+from reviews.utils import rebuild_title_scores
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает распределение оценок из TitleScore с группировкой '
+            'отзывов при запросе и пересчёт всех распределений в SQL с '
+            'подсчётом в Python. Тестовые данные создаются в транзакции '
+            'и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=10_000)
+        parser.add_argument('--reviews-per-title', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def create_data(self, titles, reviews_per_title):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000)
+            for idx in range(titles)
+        )
+        CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+            for idx in range(reviews_per_title)
+        )
+        author_ids = list(CustomUser.objects.filter(
+            username__startswith='bench'
+        ).values_list('id', flat=True))
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        for title_id in title_ids:
+            Review.objects.bulk_create(
+                Review(title_id=title_id, author_id=author_id, text='Отзыв',
+                       score=random.randint(1, MAX_SCORE))
+                for author_id in author_ids
+            )
+        return title_ids
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
+
+    def fetch_scores(self):
+        return list(Review.objects.order_by().values_list(
+            'title_id', 'score'
+        ).iterator())
+
+    def count_scores(self, rows, max_id):
+        # То же, что numpy.bincount по индексу title_id * 11 + score.
+        counts = array('l', bytes(8 * (max_id + 1) * (MAX_SCORE + 1)))
+        for title_id, score in rows:
+            counts[title_id * (MAX_SCORE + 1) + score] += 1
+        return counts
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with transaction.atomic():
+            started = time.perf_counter()
+            title_ids = self.create_data(
+                options['titles'], options['reviews_per_title']
+            )
+            rebuild_title_scores()
+            self.stdout.write(
+                f'Создано {Review.objects.count()} отзывов на '
+                f'{len(title_ids)} произведений за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+            def group_reviews():
+                list(Review.objects.filter(
+                    title_id=random.choice(title_ids)
+                ).order_by().values('score').annotate(total=Count('pk')))
+
+            def read_distribution():
+                list(TitleScore.objects.filter(
+                    title_id=random.choice(title_ids)
+                ).values_list('score', 'count'))
+
+            rows = self.fetch_scores()
+            max_id = max(title_ids)
+            per_request = {
+                'GROUP BY отзывов': self.measure(group_reviews, repeat * 20),
+                'TitleScore': self.measure(read_distribution, repeat * 20),
+            }
+            batch = {
+                'rebuild_title_scores (GROUP BY + bulk_create)':
+                    self.measure(rebuild_title_scores, repeat),
+                'выборка (title_id, score)':
+                    self.measure(self.fetch_scores, repeat),
+                'подсчёт в Python по выборке':
+                    self.measure(
+                        lambda: self.count_scores(rows, max_id), repeat
+                    ),
+            }
+            for name, elapsed in per_request.items():
+                self.stdout.write(f'{name}: {elapsed:.2f} мс на запрос')
+            for name, elapsed in batch.items():
+                self.stdout.write(f'{name}: {elapsed:.0f} мс')
+
+            transaction.set_rollback(True)
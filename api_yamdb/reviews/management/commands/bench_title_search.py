@@ -0,0 +1,69 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.search import search_titles
+
+WORDS = (
+    'побег', 'шоушенка', 'крёстный', 'отец', 'тёмный', 'рыцарь', 'список',
+    'шиндлера', 'властелин', 'колец', 'бойцовский', 'клуб', 'начало',
+    'матрица', 'город', 'бога', 'жизнь', 'прекрасна', 'зелёная', 'миля',
+    'звёздные', 'войны', 'back', 'future', 'road', 'house', 'alien',
+    'terminator', 'matrix', 'dark', 'knight', 'fight', 'club', 'green',
+)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск произведений через FTS5 и icontains. '
+            'Тестовые данные создаются в транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', default='тёмный рыцарь')
+
+    def measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset.count()
+            list(queryset[:10])
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        count, query = options['count'], options['query']
+        with transaction.atomic():
+            started = time.perf_counter()
+            batch_size = 10_000
+            for offset in range(0, count, batch_size):
+                Title.objects.bulk_create(
+                    Title(
+                        name=' '.join(random.sample(WORDS, 3)),
+                        year=random.randint(1900, 2020),
+                    )
+                    for _ in range(min(batch_size, count - offset))
+                )
+            self.stdout.write(
+                f'Создано {count} произведений за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+            queryset = Title.objects.order_by('name')
+            icontains = queryset
+            for word in query.split():
+                icontains = icontains.filter(name__icontains=word)
+            results = {
+                'icontains': self.measure(icontains, options['repeat']),
+                'fts5': self.measure(
+                    search_titles(queryset, query), options['repeat']
+                ),
+            }
+            for name, elapsed in results.items():
+                self.stdout.write(f'{name}: {elapsed:.1f} мс на страницу')
+
+            transaction.set_rollback(True)
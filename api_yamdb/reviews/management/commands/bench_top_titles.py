@@ -0,0 +1,106 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from reviews.models import MAX_SCORE, Title
+from reviews.utils import weighted_rating
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает выборку лучших произведений по индексу '
+            'weighted_rating с сортировкой по вычисляемому рейтингу и '
+            'пересчёт рейтинга одним UPDATE с пересчётом в Python. '
+            'Тестовые данные создаются в транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--limit', type=int, default=10)
+
+    def create_data(self, count):
+        batch_size = 10_000
+        for offset in range(0, count, batch_size):
+            titles = []
+            for idx in range(offset, min(offset + batch_size, count)):
+                rating_count = random.randint(0, 200)
+                titles.append(Title(
+                    name=f'Произведение {idx}', year=2000,
+                    rating_count=rating_count,
+                    rating_sum=sum(
+                        random.randint(1, MAX_SCORE)
+                        for _ in range(rating_count)
+                    ),
+                ))
+            Title.objects.bulk_create(titles)
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
+
+    def rebuild_in_sql(self):
+        Title.objects.update(
+            weighted_rating=weighted_rating(F('rating_sum'), F('rating_count'))
+        )
+
+    def compute_in_python(self):
+        # То же, что векторное выражение NumPy над столбцами sum и count.
+        weight = settings.TITLE_RATING_PRIOR_WEIGHT
+        prior = weight * settings.TITLE_RATING_PRIOR_MEAN
+        return [
+            Title(pk=pk, weighted_rating=(prior + rating_sum) / (
+                weight + rating_count
+            ))
+            for pk, rating_sum, rating_count in Title.objects.values_list(
+                'pk', 'rating_sum', 'rating_count'
+            ).iterator()
+        ]
+
+    def handle(self, *args, **options):
+        count, repeat, limit = (
+            options['count'], options['repeat'], options['limit']
+        )
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.create_data(count)
+            self.rebuild_in_sql()
+            self.stdout.write(
+                f'Создано {count} произведений за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+            rated = Title.objects.filter(rating_count__gt=0)
+            titles = self.compute_in_python()
+            queries = {
+                'top по индексу weighted_rating': lambda: list(
+                    rated.order_by('-weighted_rating', '-id')[:limit]
+                ),
+                'top по вычисляемому рейтингу': lambda: list(
+                    rated.annotate(score=weighted_rating(
+                        F('rating_sum'), F('rating_count')
+                    )).order_by('-score', '-id')[:limit]
+                ),
+            }
+            batch = {
+                'пересчёт одним UPDATE': self.rebuild_in_sql,
+                'выборка и расчёт в Python': self.compute_in_python,
+                'bulk_update рассчитанного': lambda: Title.objects.bulk_update(
+                    titles, ['weighted_rating'], batch_size=1000
+                ),
+            }
+            for name, run in queries.items():
+                elapsed = self.measure(run, repeat * 20)
+                self.stdout.write(f'{name}: {elapsed:.2f} мс на запрос')
+            for name, run in batch.items():
+                elapsed = self.measure(run, repeat)
+                self.stdout.write(f'{name}: {elapsed:.0f} мс')
+
+            transaction.set_rollback(True)
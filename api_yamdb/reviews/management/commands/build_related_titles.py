@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from reviews.related import rebuild_related_titles
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает похожие произведения для изменённых произведений'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересчитать списки всех произведений'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_related_titles(full=options['full'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Похожие произведения пересчитаны для {rebuilt} произведений'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.utils import compact_title_activity
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет часовые счётчики отзывов, вышедшие за окна популярности'
+    )
+
+    def handle(self, *args, **options):
+        deleted = compact_title_activity()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено счётчиков активности: {deleted}'
+        ))
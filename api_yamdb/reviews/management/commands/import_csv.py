@@ -3,18 +3,22 @@ import csv
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from api.cache import bump_generation
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
+from reviews.related import rebuild_related_titles
+from reviews.utils import (rebuild_comment_counts, rebuild_title_activity,
+                           rebuild_title_ratings, rebuild_title_scores)
 
 
 DICT_MODELS_REWIEWS = {
-    Category: settings.STATICFILES_DIRS / 'data/category.csv',
-    Genre: settings.STATICFILES_DIRS / 'data/genre.csv',
-    User: settings.STATICFILES_DIRS / 'data/users.csv',
-    Title: settings.STATICFILES_DIRS / 'titles.csv',
-    Review: settings.STATICFILES_DIRS / 'data/review.csv',
-    Comment: settings.STATICFILES_DIRS / 'data/comments.csv',
-    GenreTitle: settings.STATICFILES_DIRS / 'data/genre_title.csv',
+    Category: settings.STATICFILES_DIRS[0] / 'data/category.csv',
+    Genre: settings.STATICFILES_DIRS[0] / 'data/genre.csv',
+    User: settings.STATICFILES_DIRS[0] / 'data/users.csv',
+    Title: settings.STATICFILES_DIRS[0] / 'data/titles.csv',
+    Review: settings.STATICFILES_DIRS[0] / 'data/review.csv',
+    Comment: settings.STATICFILES_DIRS[0] / 'data/comments.csv',
+    GenreTitle: settings.STATICFILES_DIRS[0] / 'data/genre_title.csv',
 }
 
 
@@ -39,6 +43,15 @@ class Command(BaseCommand):
                 f'Данные из {csv_file} успешно загружены в базу данных'
             ))
 
+        rebuild_title_ratings()
+        rebuild_comment_counts()
+        rebuild_title_scores()
+        rebuild_title_activity()
+        rebuild_related_titles(full=True)
+        # bulk_create не отправляет сигналы моделей.
+        for model in DICT_MODELS_REWIEWS:
+            bump_generation(model)
+
         self.stdout.write(self.style.SUCCESS(
             'Все данные успешно загружены в базу данных!'
         ))
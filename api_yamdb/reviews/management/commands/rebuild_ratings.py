@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_generation
+from reviews.models import Comment, Review, Title
+from reviews.utils import (rebuild_comment_counts, rebuild_title_activity,
+                           rebuild_title_ratings, rebuild_title_scores)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает сохранённые рейтинги, распределения оценок и '
+        'активность произведений и счётчики комментариев отзывов'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_title_ratings()
+            rebuild_title_scores()
+            rebuild_title_activity()
+            reviews = rebuild_comment_counts()
+        # QuerySet.update и bulk_create не отправляют сигналы моделей:
+        # поколения меняются после фиксации, как в TitleBulkWriter.
+        for model in (Title, Review, Comment):
+            bump_generation(model)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны для {updated} произведений, '
+            f'счётчики комментариев - для {reviews} отзывов'
+        ))
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# Схема индексов на момент миграции: reviews.search может меняться,
+# а миграция должна создавать те же таблицы, что и при первом запуске.
+POST_SEARCH_TABLES = ('reviews_review', 'reviews_comment')
+
+
+def get_post_search_sql(source):
+    table = f'{source}_fts'
+    return (
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            text,
+            content='{source}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ai
+        AFTER INSERT ON {source} BEGIN
+            INSERT INTO {table}(rowid, text) VALUES (new.id, new.text);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ad
+        AFTER DELETE ON {source} BEGIN
+            INSERT INTO {table}({table}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_au
+        AFTER UPDATE OF text ON {source} BEGIN
+            INSERT INTO {table}({table}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+            INSERT INTO {table}(rowid, text) VALUES (new.id, new.text);
+        END
+        """,
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    )
+
+
+def create_post_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for source in POST_SEARCH_TABLES:
+        for statement in get_post_search_sql(source):
+            schema_editor.execute(statement)
+
+
+def drop_post_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for source in POST_SEARCH_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {source}_fts_{suffix}'
+            )
+        schema_editor.execute(f'DROP TABLE IF EXISTS {source}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_post_search, drop_post_search),
+    ]
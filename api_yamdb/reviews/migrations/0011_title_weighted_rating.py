@@ -0,0 +1,35 @@
+# Generated by Django 3.2 on 2026-10-18 19:54
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, ExpressionWrapper, Value
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    weight = settings.TITLE_RATING_PRIOR_WEIGHT
+    Title.objects.update(weighted_rating=ExpressionWrapper(
+        (Value(float(weight * settings.TITLE_RATING_PRIOR_MEAN))
+         + F('rating_sum')) / (Value(weight) + F('rating_count')),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=0, editable=False, verbose_name='взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.RunPython(fill_weighted_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 20:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_title_activity(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleActivity = apps.get_model('reviews', 'TitleActivity')
+    since = timezone.now() - max(settings.TRENDING_WINDOWS.values())
+    counts = Review.objects.filter(
+        pub_date__gte=since.replace(minute=0, second=0, microsecond=0)
+    ).order_by().values('title', bucket=TruncHour('pub_date')).annotate(
+        count=Count('pk')
+    )
+    TitleActivity.objects.bulk_create(
+        TitleActivity(title_id=row['title'], bucket=row['bucket'],
+                      count=row['count'])
+        for row in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(verbose_name='начало часа')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'активность',
+                'verbose_name_plural': 'активность',
+                'ordering': ('-bucket',),
+                'default_related_name': 'activity',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titleactivity',
+            constraint=models.UniqueConstraint(fields=('bucket', 'title'), name='unique_title_activity'),
+        ),
+        migrations.RunPython(fill_title_activity, migrations.RunPython.noop),
+    ]
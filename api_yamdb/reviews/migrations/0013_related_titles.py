@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 20:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_title_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='related_stale',
+            field=models.BooleanField(db_index=True, default=True, editable=False, verbose_name='похожие произведения устарели'),
+        ),
+        migrations.CreateModel(
+            name='RelatedTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity', models.FloatField(verbose_name='сходство')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.title', verbose_name='похожее произведение')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_titles', to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'похожее произведение',
+                'verbose_name_plural': 'похожие произведения',
+                'ordering': ('title', '-similarity', 'related'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedtitle',
+            constraint=models.UniqueConstraint(fields=('title', 'related'), name='unique_related_title'),
+        ),
+    ]
@@ -1,13 +1,43 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.conf import settings
 from django.contrib import admin
-from django.db import models
+from django.db import models, transaction
 
 from users.models import CustomUser
 
 
 User = CustomUser
 
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+
+class SignalManagedFieldsMixin:
+    '''Не перезаписывает поля, которые ведут сигналы, при save() целиком.
+
+    Поля из signal_managed_fields меняются только UPDATE из сигналов:
+    счётчики - атомарными приращениями, флаги - установкой значения.
+    Без этого save() объекта, загруженного до такого изменения, вернул
+    бы в базу устаревшее значение поля. Отложенные поля (only/defer)
+    тоже не сохраняются, как и в обычном save() Django: иначе каждое
+    из них догружалось бы отдельным запросом.
+    '''
+
+    signal_managed_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (not args and not self._state.adding
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.signal_managed_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class ВaseCategoyGenre(models.Model):
     """Общая для жанра и катеогрии."""
@@ -39,9 +69,13 @@ class Category(ВaseCategoyGenre):
         verbose_name_plural = 'категории'
 
 
-class Title(models.Model):
+class Title(SignalManagedFieldsMixin, models.Model):
     """Модель публикации."""
 
+    signal_managed_fields = (
+        'rating_sum', 'rating_count', 'weighted_rating', 'related_stale'
+    )
+
     name = models.CharField('название', max_length=settings.MAX_NAME_LENGTH)
     year = models.PositiveSmallIntegerField(
         verbose_name='год создания',
@@ -65,12 +99,41 @@ class Title(models.Model):
         blank=True,
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        'сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'количество оценок',
+        default=0,
+        editable=False
+    )
+    weighted_rating = models.FloatField(
+        'взвешенный рейтинг',
+        default=0,
+        editable=False
+    )
+    related_stale = models.BooleanField(
+        'похожие произведения устарели',
+        default=True,
+        editable=False,
+        db_index=True
+    )
 
     class Meta:
         default_related_name = 'titles'
         verbose_name = 'произведение'
         verbose_name_plural = 'произведения'
         ordering = ('year',)
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['weighted_rating', 'id'],
+                name='title_weighted_rating_idx'
+            ),
+        ]
 
     @admin.display(description='жанры')
     def display_genres(self):
@@ -80,6 +143,13 @@ class Title(models.Model):
         """
         return ', '.join([genre.name for genre in self.genre.all()[:3]])
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения по сохранённым агрегатам."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
     def __str__(self):
         return self.name[:settings.CHARACTER_LIMIT]
 
@@ -99,6 +169,90 @@ class GenreTitle(models.Model):
     )
 
 
+class RelatedTitle(models.Model):
+    """Похожее произведение по жанрам и категории."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='related_titles',
+        verbose_name='произведение',
+    )
+    related = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='похожее произведение',
+    )
+    similarity = models.FloatField('сходство')
+
+    class Meta:
+        verbose_name = 'похожее произведение'
+        verbose_name_plural = 'похожие произведения'
+        ordering = ('title', '-similarity', 'related')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'related'],
+                name='unique_related_title')
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} -> {self.related_id}: {self.similarity}'
+
+
+class TitleScore(models.Model):
+    """Число отзывов произведения с данной оценкой."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='произведение',
+    )
+    score = models.PositiveSmallIntegerField('оценка')
+    count = models.PositiveIntegerField('количество отзывов', default=0)
+
+    class Meta:
+        default_related_name = 'score_counts'
+        verbose_name = 'распределение оценок'
+        verbose_name_plural = 'распределения оценок'
+        ordering = ('title', 'score')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_title_score')
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
+class TitleActivity(models.Model):
+    """Число отзывов на произведение за один час."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='произведение',
+    )
+    bucket = models.DateTimeField('начало часа')
+    count = models.PositiveIntegerField('количество отзывов', default=0)
+
+    class Meta:
+        default_related_name = 'activity'
+        verbose_name = 'активность'
+        verbose_name_plural = 'активность'
+        ordering = ('-bucket',)
+        constraints = [
+            # Индекс начинается с bucket: по нему выбираются окна.
+            models.UniqueConstraint(
+                fields=['bucket', 'title'],
+                name='unique_title_activity')
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.bucket} - {self.count}'
+
+
 class AbstractPost(models.Model):
     author = models.ForeignKey(
         User,
@@ -112,21 +266,48 @@ class AbstractPost(models.Model):
         ordering = ("-pub_date",)
         abstract = True
 
+    def save(self, *args, **kwargs):
+        # Счётчики, которые меняют сигналы post_save, обновляются в той же
+        # транзакции, что и сама запись.
+        with transaction.atomic(savepoint=False):
+            self.begin_write()
+            super().save(*args, **kwargs)
+
+    def begin_write(self):
+        '''Берёт блокировку записи SQLite до первого чтения в транзакции.
+
+        Запись через триггеры обновляет индекс FTS5, а первое обращение
+        соединения к индексу читает его служебные таблицы. Транзакция,
+        начатая с чтения, должна потом повысить блокировку до записи, и
+        если в это время пишет другое соединение, SQLite сразу отвечает
+        "database is locked", не дожидаясь его. Пустое обновление первой
+        командой действует как BEGIN IMMEDIATE, которого нет в Django 3.2.
+        '''
+        connection = transaction.get_connection()
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {self._meta.db_table} SET id = id WHERE 0'
+            )
+
     def __str__(self):
         return self.text[:settings.CHARACTER_LIMIT]
 
 
-class Review(AbstractPost):
+class Review(SignalManagedFieldsMixin, AbstractPost):
     """Модель Отзывов"""
 
+    signal_managed_fields = ('comments_count',)
+
     text = models.TextField(
         "текст отзыва",
         help_text="введите текст отзыва",
     )
     score = models.PositiveSmallIntegerField(
         validators=[
-            MinValueValidator(1, "минимальная оценка - 1"),
-            MaxValueValidator(10, "максимальная оценка - 10"),
+            MinValueValidator(MIN_SCORE, "минимальная оценка - 1"),
+            MaxValueValidator(MAX_SCORE, "максимальная оценка - 10"),
         ],
         verbose_name="оценка произведения",
     )
@@ -135,6 +316,11 @@ class Review(AbstractPost):
         on_delete=models.CASCADE,
         verbose_name="произведение с отзывом",
     )
+    comments_count = models.PositiveIntegerField(
+        'количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta(AbstractPost.Meta):
         default_related_name = "reviews"
@@ -145,6 +331,12 @@ class Review(AbstractPost):
                 fields=['author', 'title'],
                 name='unique_review')
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
 
 class Comment(AbstractPost):
@@ -162,3 +354,9 @@ class Comment(AbstractPost):
         default_related_name = 'comments'
         verbose_name_plural = 'коментарии'
         verbose_name = 'коментарий'
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
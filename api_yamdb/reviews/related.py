@@ -0,0 +1,129 @@
+"""Похожие произведения по жанрам и категории.
+
+Признаки произведения - его жанры и категория. Сходство двух
+произведений - коэффициент Жаккара их множеств признаков. Соседи
+ищутся через обратный индекс «признак -> произведения»: сравниваются
+только произведения, у которых есть общий признак, а не все пары.
+
+Списки хранятся в RelatedTitle. Изменения жанров и категорий помечают
+произведения флагом related_stale, и пересчёт затрагивает только их и
+произведения, в чьих списках они могут появиться или исчезнуть.
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from reviews.models import RelatedTitle, Title
+
+TitleGenre = Title.genre.through
+
+
+def load_features():
+    """Признаки всех произведений, их число и обратный индекс по ним."""
+    features = defaultdict(set)
+    for title_id, genre_id in TitleGenre.objects.values_list(
+        'title_id', 'genre_id'
+    ).iterator():
+        features[title_id].add(('genre', genre_id))
+    for title_id, category_id in Title.objects.filter(
+        category__isnull=False
+    ).values_list('id', 'category_id').iterator():
+        features[title_id].add(('category', category_id))
+    index = defaultdict(list)
+    for title_id, title_features in features.items():
+        for feature in title_features:
+            index[feature].append(title_id)
+    sizes = {
+        title_id: len(title_features)
+        for title_id, title_features in features.items()
+    }
+    return features, sizes, index
+
+
+def find_related(title_id, features, sizes, index, limit):
+    '''Ближайшие соседи произведения: список пар (id, сходство).
+
+    Сходство зависит только от числа общих признаков и числа признаков
+    соседа, поэтому оно вычисляется один раз для каждой такой пары
+    чисел, а не для каждого кандидата. При равном сходстве выше стоит
+    произведение с меньшим id.
+    '''
+    own = features.get(title_id)
+    if not own:
+        return []
+    shared = Counter()
+    for feature in own:
+        shared.update(index[feature])
+    del shared[title_id]
+    groups = defaultdict(list)
+    for other_id, common in shared.items():
+        groups[common, sizes[other_id]].append(other_id)
+    by_similarity = defaultdict(list)
+    for (common, size), ids in groups.items():
+        by_similarity[common / (len(own) + size - common)].extend(ids)
+    related = []
+    for similarity in sorted(by_similarity, reverse=True):
+        ids = heapq.nsmallest(limit - len(related), by_similarity[similarity])
+        related.extend((other_id, similarity) for other_id in ids)
+        if len(related) >= limit:
+            break
+    return related
+
+
+def get_affected(stale, index, features):
+    '''Произведения, списки которых могут измениться.
+
+    Это сами изменённые произведения, произведения с общими признаками
+    (изменённое может войти в их список) и те, в чьих списках оно уже
+    есть (оно может из них выпасть).
+    '''
+    affected = set(stale)
+    for title_id in stale:
+        for feature in features.get(title_id, ()):
+            affected.update(index[feature])
+    affected.update(
+        RelatedTitle.objects.filter(related_id__in=stale).values_list(
+            'title_id', flat=True
+        )
+    )
+    return affected
+
+
+def rebuild_related_titles(full=False, limit=None):
+    '''Пересчитывает списки похожих произведений.
+
+    Без full пересчитываются только произведения, затронутые
+    изменениями с прошлого запуска. Флаг снимается до чтения признаков:
+    изменения, сделанные во время пересчёта, снова поднимут его.
+    Возвращает число пересчитанных произведений.
+    '''
+    limit = limit or settings.RELATED_TITLES_LIMIT
+    stale = set(Title.objects.filter(related_stale=True).values_list(
+        'id', flat=True
+    ))
+    if not (full or stale):
+        return 0
+    Title.objects.filter(pk__in=stale).update(related_stale=False)
+
+    features, sizes, index = load_features()
+    if full:
+        affected = set(Title.objects.values_list('id', flat=True))
+    else:
+        affected = get_affected(stale, index, features)
+    related = [
+        RelatedTitle(title_id=title_id, related_id=other_id,
+                     similarity=similarity)
+        for title_id in affected
+        for other_id, similarity in find_related(
+            title_id, features, sizes, index, limit
+        )
+    ]
+    with transaction.atomic():
+        if full:
+            RelatedTitle.objects.all().delete()
+        else:
+            RelatedTitle.objects.filter(title_id__in=affected).delete()
+        RelatedTitle.objects.bulk_create(related, batch_size=1000)
+    return len(affected)
@@ -0,0 +1,173 @@
+"""Полнотекстовый поиск по произведениям, отзывам и комментариям.
+
+На SQLite используются внешние (external content) индексы FTS5 над
+таблицами моделей, которые поддерживаются в актуальном состоянии
+триггерами базы данных: они срабатывают и для bulk_create, и для
+QuerySet.update, и для импорта из CSV. На других СУБД поиск
+откатывается к icontains по каждому слову запроса.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Comment, Review, Title
+
+
+def is_search_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def get_search_terms(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def build_match_query(terms):
+    """Собирает запрос MATCH: все слова обязательны, с поиском по префиксу.
+
+    Каждое слово берётся в кавычки, поэтому операторы FTS5 во вводе
+    пользователя не интерпретируются. Поиск по префиксу частично
+    заменяет отсутствующий в FTS5 стемминг для русского языка.
+    """
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class SearchIndex:
+    '''Индекс FTS5 над текстовыми полями модели.
+
+    weights задают вес каждого поля в ранжировании bm25(),
+    fallback_field - поле для icontains на СУБД без FTS5.
+    '''
+
+    def __init__(self, model, fields, weights, fallback_field):
+        self.model = model
+        self.fields = fields
+        self.weights = weights
+        self.fallback_field = fallback_field
+
+    @property
+    def source(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return f'{self.source}_fts'
+
+    @property
+    def triggers(self):
+        return tuple(
+            f'{self.table}_{suffix}' for suffix in ('ai', 'ad', 'au')
+        )
+
+    def get_sql(self):
+        columns = ', '.join(self.fields)
+        new_values = ', '.join(f'new.{field}' for field in self.fields)
+        old_values = ', '.join(f'old.{field}' for field in self.fields)
+        insert = (
+            f'INSERT INTO {self.table}(rowid, {columns}) '
+            f'VALUES (new.id, {new_values});'
+        )
+        delete = (
+            f'INSERT INTO {self.table}({self.table}, rowid, {columns}) '
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        ai, ad, au = self.triggers
+        return (
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+            f"{columns}, content='{self.source}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER IF NOT EXISTS {ai} AFTER INSERT ON '
+            f'{self.source} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {ad} AFTER DELETE ON '
+            f'{self.source} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {au} AFTER UPDATE OF {columns} '
+            f'ON {self.source} BEGIN {delete} {insert} END',
+        )
+
+    def install(self, connection):
+        """Создаёт индекс и триггеры, если их нет, и перестраивает индекс."""
+        if not is_search_supported(connection):
+            return
+        with connection.cursor() as cursor:
+            for statement in self.get_sql():
+                cursor.execute(statement)
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+
+    def uninstall(self, connection):
+        if not is_search_supported(connection):
+            return
+        with connection.cursor() as cursor:
+            for trigger in self.triggers:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def is_installed(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE "
+                "(type = 'trigger' AND name IN (%s, %s, %s)) "
+                "OR (type = 'table' AND name = %s)",
+                (*self.triggers, self.table)
+            )
+            (installed,) = cursor.fetchone()
+        return installed == len(self.triggers) + 1
+
+    def search(self, queryset, text, *ordering):
+        '''Фильтрует queryset по поисковому запросу.
+
+        Результаты упорядочены по релевантности (bm25), затем по полям
+        ordering. Возвращается QuerySet, поэтому поиск сочетается с
+        остальными фильтрами и пагинацией.
+        '''
+        terms = get_search_terms(text)
+        if not terms:
+            return queryset.none()
+        if not is_search_supported(connections[queryset.db]):
+            condition = Q()
+            for term in terms:
+                condition &= Q(**{f'{self.fallback_field}__icontains': term})
+            return queryset.filter(condition).order_by(*ordering)
+
+        weights = ', '.join(map(str, self.weights))
+        match = build_match_query(terms)
+        # Ранг считается подзапросом по той же строке индекса: bm25()
+        # доступна только в запросе с MATCH к таблице FTS5.
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (match,)
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {self.source}.id',
+            (match,)
+        )).order_by('search_rank', *ordering)
+
+
+# Совпадения в названии произведения важнее совпадений в описании.
+TITLE_INDEX = SearchIndex(Title, ('name', 'description'), (10.0, 1.0),
+                          'name')
+REVIEW_INDEX = SearchIndex(Review, ('text',), (1.0,), 'text')
+COMMENT_INDEX = SearchIndex(Comment, ('text',), (1.0,), 'text')
+SEARCH_INDEXES = (TITLE_INDEX, REVIEW_INDEX, COMMENT_INDEX)
+
+
+def ensure_search_indexes(using='default', **kwargs):
+    '''Восстанавливает поисковые индексы и триггеры после миграций.
+
+    SQLite пересоздаёт таблицу при многих изменениях схемы, и триггеры
+    старой таблицы при этом удаляются вместе с ней. Индексы, чья
+    миграция ещё не применена, пропускаются.
+    '''
+    connection = connections[using]
+    if not is_search_supported(connection):
+        return
+    tables = connection.introspection.table_names()
+    for index in SEARCH_INDEXES:
+        if index.table in tables and not index.is_installed(connection):
+            index.install(connection)
+
+
+def search_titles(queryset, text):
+    return TITLE_INDEX.search(queryset, text, 'name')
@@ -0,0 +1,200 @@
+"""Сигналы приложения reviews."""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete, pre_save)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleActivity, TitleScore)
+from reviews.utils import activity_bucket, weighted_rating
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет сохранённые агрегаты рейтинга произведения."""
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        weighted_rating=weighted_rating(rating_sum, rating_count),
+    )
+
+
+def change_counter(model, delta, **lookup):
+    """Атомарно изменяет поле count строки, создавая её при первом учёте."""
+    counters = model.objects.filter(**lookup)
+    if counters.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        counters.update(count=F('count') + delta)
+
+
+def change_score_count(title_id, score, delta):
+    """Атомарно изменяет число отзывов произведения с данной оценкой."""
+    change_counter(TitleScore, delta, title_id=title_id, score=score)
+
+
+def change_title_activity(title_id, pub_date, delta):
+    """Атомарно изменяет число отзывов произведения за час публикации."""
+    change_counter(
+        TitleActivity, delta, title_id=title_id,
+        bucket=activity_bucket(pub_date)
+    )
+
+
+def change_comments_count(review_id, delta):
+    """Атомарно изменяет счётчик комментариев отзыва."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает оценку и произведение отзыва, загруженные из базы."""
+    instance._rating_state = (
+        instance.__dict__.get('title_id'),
+        instance.__dict__.get('score'),
+    )
+
+
+@receiver(pre_save, sender=Review)
+def load_review_score(sender, instance, **kwargs):
+    '''Перечитывает сохранённые оценку и произведение отзыва.
+
+    Снимок post_init сделан при загрузке объекта, до блокировки записи,
+    и два одновременных изменения одного отзыва посчитали бы разницу от
+    одной и той же старой оценки. pre_save вызывается в транзакции
+    AbstractPost.save после begin_write, поэтому строка, прочитанная
+    здесь, не изменится до конца транзакции: на SQLite её защищает
+    блокировка записи, на других СУБД - select_for_update.
+    '''
+    if instance._state.adding:
+        return
+    instance._rating_state = Review.objects.select_for_update().filter(
+        pk=instance.pk
+    ).values_list('title_id', 'score').first() or (None, None)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Пересчитывает рейтинг и распределение оценок при записи отзыва."""
+    old_title_id, old_score = instance._rating_state
+    if created or old_title_id is None:
+        change_title_rating(instance.title_id, instance.score, 1)
+        change_score_count(instance.title_id, instance.score, 1)
+        change_title_activity(instance.title_id, instance.pub_date, 1)
+    elif old_title_id != instance.title_id:
+        change_title_rating(old_title_id, -old_score, -1)
+        change_title_rating(instance.title_id, instance.score, 1)
+        change_score_count(old_title_id, old_score, -1)
+        change_score_count(instance.title_id, instance.score, 1)
+        change_title_activity(old_title_id, instance.pub_date, -1)
+        change_title_activity(instance.title_id, instance.pub_date, 1)
+    elif old_score != instance.score:
+        change_title_rating(instance.title_id, instance.score - old_score, 0)
+        change_score_count(instance.title_id, old_score, -1)
+        change_score_count(instance.title_id, instance.score, 1)
+    instance._rating_state = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга и распределения."""
+    old_title_id, old_score = instance._rating_state
+    if old_title_id is None or old_score is None:
+        old_title_id, old_score = instance.title_id, instance.score
+    change_title_rating(old_title_id, -old_score, -1)
+    change_score_count(old_title_id, old_score, -1)
+    change_title_activity(old_title_id, instance.pub_date, -1)
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_review(sender, instance, **kwargs):
+    """Запоминает отзыв комментария, загруженный из базы."""
+    instance._counted_review_id = instance.__dict__.get('review_id')
+
+
+@receiver(pre_save, sender=Comment)
+def load_comment_review(sender, instance, **kwargs):
+    """Догружает исходный отзыв, если поле было отложено при выборке."""
+    if instance._state.adding or instance._counted_review_id is not None:
+        return
+    instance._counted_review_id = Comment.objects.filter(
+        pk=instance.pk
+    ).values_list('review_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, **kwargs):
+    """Учитывает новый комментарий или его перенос в другой отзыв."""
+    old_review_id = instance._counted_review_id
+    if created or old_review_id is None:
+        change_comments_count(instance.review_id, 1)
+    elif old_review_id != instance.review_id:
+        change_comments_count(old_review_id, -1)
+        change_comments_count(instance.review_id, 1)
+    instance._counted_review_id = instance.review_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    """Исключает удалённый комментарий из счётчика отзыва."""
+    change_comments_count(
+        instance._counted_review_id or instance.review_id, -1
+    )
+
+
+def mark_related_stale(titles):
+    """Помечает похожие произведения для пересчёта."""
+    titles.filter(related_stale=False).update(related_stale=True)
+
+
+@receiver(post_init, sender=Title)
+def remember_title_category(sender, instance, **kwargs):
+    """Запоминает категорию произведения, загруженную из базы."""
+    instance._related_category_id = instance.__dict__.get('category_id')
+
+
+@receiver(post_save, sender=Title)
+def update_related_on_category(sender, instance, created, **kwargs):
+    """Помечает произведение при смене категории."""
+    if (not created and 'category_id' in instance.__dict__
+            and instance._related_category_id != instance.category_id):
+        mark_related_stale(Title.objects.filter(pk=instance.pk))
+    instance._related_category_id = instance.__dict__.get('category_id')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_related_on_genres(sender, instance, action, reverse, pk_set,
+                             **kwargs):
+    """Помечает произведения, у которых изменились жанры."""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        mark_related_stale(Title.objects.filter(pk=instance.pk))
+    elif pk_set:
+        mark_related_stale(Title.objects.filter(pk__in=pk_set))
+    else:
+        mark_related_stale(Title.objects.all())
+
+
+@receiver(pre_delete, sender=Title)
+def update_related_on_title_delete(sender, instance, **kwargs):
+    """Помечает произведения, в списках которых есть удаляемое."""
+    mark_related_stale(Title.objects.filter(
+        related_titles__related=instance
+    ))
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Category)
+def update_related_on_feature_delete(sender, instance, **kwargs):
+    """Помечает произведения удаляемого жанра или категории."""
+    lookup = 'genre' if sender is Genre else 'category'
+    mark_related_stale(Title.objects.filter(**{lookup: instance}))
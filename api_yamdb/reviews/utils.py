@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.db.models import (Count, ExpressionWrapper, F, FloatField,
+                              IntegerField, OuterRef, Subquery, Sum, Value)
+from django.db.models.functions import Coalesce, TruncHour
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title, TitleActivity, TitleScore
+
+
+def weighted_rating(rating_sum, rating_count):
+    '''Байесовский рейтинг по сумме и числу оценок.
+
+    К оценкам произведения добавляются TITLE_RATING_PRIOR_WEIGHT
+    условных оценок TITLE_RATING_PRIOR_MEAN, поэтому несколько высоких
+    оценок не поднимают произведение выше хорошо оценённых многими.
+    '''
+    weight = settings.TITLE_RATING_PRIOR_WEIGHT
+    return ExpressionWrapper(
+        (Value(float(weight * settings.TITLE_RATING_PRIOR_MEAN)) + rating_sum)
+        / (Value(weight) + rating_count),
+        output_field=FloatField()
+    )
+
+
+def activity_bucket(moment):
+    """Начало часа, в счётчик которого попадает момент времени."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def get_activity_since(window):
+    """Начало первого часового счётчика окна популярности."""
+    return activity_bucket(timezone.now() - window)
+
+
+def rebuild_title_ratings():
+    """Пересчитывает агрегаты рейтинга всех произведений с нуля.
+
+    Нужна после массовых операций, которые не вызывают сигналы
+    (bulk_create, QuerySet.update и т.п.).
+    """
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    updated = Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total'),
+                     output_field=IntegerField()),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total'),
+                     output_field=IntegerField()),
+            0
+        ),
+    )
+    Title.objects.update(
+        weighted_rating=weighted_rating(F('rating_sum'), F('rating_count'))
+    )
+    return updated
+
+
+def rebuild_comment_counts():
+    """Пересчитывает счётчики комментариев всех отзывов с нуля."""
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    return Review.objects.update(
+        comments_count=Coalesce(
+            Subquery(comments.annotate(total=Count('pk')).values('total'),
+                     output_field=IntegerField()),
+            0
+        ),
+    )
+
+
+def rebuild_title_scores():
+    """Пересчитывает распределения оценок всех произведений с нуля.
+
+    Все распределения строятся одним запросом с группировкой по
+    произведению и оценке и записываются одной пакетной вставкой.
+    """
+    counts = Review.objects.order_by().values('title', 'score').annotate(
+        total=Count('pk')
+    )
+    TitleScore.objects.all().delete()
+    return len(TitleScore.objects.bulk_create(
+        TitleScore(title_id=row['title'], score=row['score'],
+                   count=row['total'])
+        for row in counts.iterator()
+    ))
+
+
+def rebuild_title_activity():
+    """Пересчитывает часовые счётчики отзывов за самое длинное окно."""
+    since = get_activity_since(max(settings.TRENDING_WINDOWS.values()))
+    counts = Review.objects.filter(pub_date__gte=since).order_by().values(
+        'title', bucket=TruncHour('pub_date')
+    ).annotate(total=Count('pk'))
+    TitleActivity.objects.all().delete()
+    return len(TitleActivity.objects.bulk_create(
+        TitleActivity(title_id=row['title'], bucket=row['bucket'],
+                      count=row['total'])
+        for row in counts.iterator()
+    ))
+
+
+def compact_title_activity():
+    """Удаляет счётчики, вышедшие за самое длинное окно, и пустые."""
+    since = get_activity_since(max(settings.TRENDING_WINDOWS.values()))
+    deleted, _ = TitleActivity.objects.filter(bucket__lt=since).delete()
+    empty, _ = TitleActivity.objects.filter(count=0).delete()
+    return deleted + empty
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
 
 
 @admin.register(CustomUser)
@@ -25,3 +25,17 @@ class UserAdmin(UserAdmin):
         'is_staff',
     )
     list_editable = ('role',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    "Очередь исходящих писем"
+
+    list_display = (
+        'recipient',
+        'subject',
+        'created',
+        'next_attempt',
+        'attempts',
+    )
+    readonly_fields = ('created',)
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import CustomUser
+from users.tokens import (USER_CLAIMS, USER_CLAIMS_FIELDS,
+                          get_remembered_claims, remember_user_claims)
+
+
+def build_user(user_id, claims):
+    '''Пользователь из данных токена без обращения к базе.
+
+    Остальные поля модели отложены (deferred) и догружаются из базы
+    только при обращении к ним.
+    '''
+    values = dict(zip(USER_CLAIMS_FIELDS, claims), id=user_id)
+    fields = [
+        field.attname for field in CustomUser._meta.concrete_fields
+        if field.attname in values
+    ]
+    return CustomUser.from_db(
+        DEFAULT_DB_ALIAS, fields, [values[name] for name in fields]
+    )
+
+
+class TokenCache:
+    '''LRU-кеш проверенных токенов в памяти процесса.
+
+    Ключ - токен из заголовка в исходном виде, значение - проверенный
+    токен и момент, после которого запись недействительна: не позже
+    срока действия (exp) самого токена. При переполнении вытесняется
+    запись, к которой дольше всего не обращались. Размер 0 отключает
+    кеш.
+    '''
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, raw_token):
+        with self.lock:
+            entry = self.entries.get(raw_token)
+            if entry is not None and entry[0] > time.time():
+                self.entries.move_to_end(raw_token)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.entries[raw_token]
+            self.misses += 1
+            return None
+
+    def set(self, raw_token, validated_token):
+        expires = validated_token.get('exp')
+        if not self.maxsize or expires is None:
+            return
+        with self.lock:
+            self.entries[raw_token] = (expires, validated_token)
+            self.entries.move_to_end(raw_token)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    '''Аутентификация по JWT без запроса пользователя к базе.
+
+    Если данные пользователя в токене совпадают с запомненными в кеше,
+    пользователь строится из токена. Иначе (старый токен, данные
+    изменились или вытеснены из кеша) пользователь загружается из базы,
+    как в JWTAuthentication, и его данные запоминаются заново.
+
+    Проверенные токены хранятся в token_cache, поэтому повторный запрос
+    с тем же токеном не декодирует его и не проверяет подпись заново.
+    '''
+
+    token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+    def get_validated_token(self, raw_token):
+        validated_token = self.token_cache.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            self.token_cache.set(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        claims = validated_token.get(USER_CLAIMS)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (claims is not None and user_id is not None
+                and get_remembered_claims(user_id) == claims):
+            user = build_user(user_id, claims)
+            if not user.is_active:
+                raise AuthenticationFailed(
+                    'User is inactive', code='user_inactive'
+                )
+            return user
+        user = super().get_user(validated_token)
+        remember_user_claims(user)
+        return user
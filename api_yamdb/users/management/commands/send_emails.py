@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.utils import send_emails
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди пачками через одно соединение. '
+            'Без --loop завершается, когда писем к отправке не осталось.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь раз в --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_emails(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total_sent}, неудачных попыток: '
+            f'{total_failed}'
+        ))
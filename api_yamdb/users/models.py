@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 from .validators import check_me_name
 
@@ -47,3 +48,32 @@ class CustomUser(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == self.ROLE_MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    '''Письмо в очереди на отправку (outbox).
+
+    Запрос только сохраняет письмо, а отправляет его команда
+    send_emails. Отправленные письма удаляются из очереди. next_attempt
+    - время следующей попытки; у писем, исчерпавших попытки, оно пустое.
+    '''
+
+    recipient = models.EmailField('Получатель',
+                                  max_length=settings.EMAIL_MAX_LEN)
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    next_attempt = models.DateTimeField('Следующая попытка',
+                                        null=True,
+                                        default=timezone.now,
+                                        db_index=True)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('next_attempt', 'id')
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -8,7 +8,7 @@ class IsStaffOwnerOrReadOnly(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return (request.method in SAFE_METHODS or request.user.is_moderator
-                or request.user.is_admin or request.user == obj.author)
+                or request.user.is_admin or request.user.pk == obj.author_id)
 
 
 class IsAdminOrReadOnly(BasePermission):
@@ -27,3 +27,10 @@ class IsAdmin(BasePermission):
 
     def has_permission(self, request, view):
         return request.user.is_admin
+
+
+class IsModeratorOrAdmin(BasePermission):
+    "Пермишен, проверяющий, есть ли у пользователя права модератора или выше."
+
+    def has_permission(self, request, view):
+        return request.user.is_moderator or request.user.is_admin
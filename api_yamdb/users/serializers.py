@@ -2,8 +2,10 @@ import math
 import random
 
 from django.conf import settings
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
 from users.models import CustomUser
 
@@ -16,8 +18,11 @@ class UserCodeSerializer(serializers.ModelSerializer):
     быть равно значению 'me'.
     Поле confirmation_code доступно только для записи и не
     отправляет пользователю в ответе на запрос.
-    Поле email проверяется на уникальность и ограничено в длине
-    переменной EMAIL_MAX_LEN.
+    Поле email ограничено в длине переменной EMAIL_MAX_LEN.
+    Уникальность username и email проверяется одним запросом в
+    validate: если оба поля принадлежат одному пользователю, он
+    возвращается в validated_data['user'] (иначе там None), если
+    разным или занятое поле не совпадает - возвращается ошибка.
     '''
 
     class Meta:
@@ -35,12 +40,46 @@ class UserCodeSerializer(serializers.ModelSerializer):
 
         return OTP
 
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
     def validate(self, data):
-        confirmation_code = self.get_confirmation_code()
         validated_data = super(UserCodeSerializer, self).validate(data)
-        validated_data['confirmation_code'] = confirmation_code
+        errors = {}
+        validated_data['user'] = None
+        for user in CustomUser.objects.filter(
+            Q(username=data['username']) | Q(email=data['email'])
+        )[:2]:
+            if (user.username, user.email) == (data['username'],
+                                               data['email']):
+                validated_data['user'] = user
+                continue
+            for field in ('username', 'email'):
+                if getattr(user, field) == data[field]:
+                    errors[field] = [self.get_unique_message(field)]
+        if errors:
+            raise serializers.ValidationError(errors)
+        validated_data['confirmation_code'] = self.get_confirmation_code()
         return validated_data
 
+    def get_unique_message(self, field):
+        model_field = CustomUser._meta.get_field(field)
+        return model_field.error_messages['unique'] % {
+            'model_name': CustomUser._meta.verbose_name,
+            'field_label': model_field.verbose_name,
+        }
+
+    def update(self, instance, validated_data):
+        instance.confirmation_code = validated_data['confirmation_code']
+        instance.save(update_fields=['confirmation_code'])
+        return instance
+
 
 class UserJWTSerializer(serializers.Serializer):
     "Класс-сериализатор для отправки пользователю JWT-токена"
@@ -61,6 +100,8 @@ class UserJWTSerializer(serializers.Serializer):
 
         if user:
             if user.confirmation_code == confirmation_code:
+                # Пользователь нужен представлению для выпуска токена.
+                data['user'] = user
                 return data
 
             raise serializers.ValidationError(
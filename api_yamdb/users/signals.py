@@ -0,0 +1,18 @@
+"""Сигналы приложения users."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import CustomUser
+from users.tokens import forget_user_claims, remember_user_claims
+
+
+@receiver(post_save, sender=CustomUser)
+def update_user_claims(sender, instance, **kwargs):
+    """Обновляет данные пользователя, с которыми сверяются токены."""
+    remember_user_claims(instance)
+
+
+@receiver(post_delete, sender=CustomUser)
+def delete_user_claims(sender, instance, **kwargs):
+    """Отключает быстрый путь для токенов удалённого пользователя."""
+    forget_user_claims(instance.pk)
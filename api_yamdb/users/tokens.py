@@ -0,0 +1,54 @@
+"""JWT-токены с подписанными данными пользователя.
+
+В токен записываются поля пользователя, от которых зависят права
+доступа (claims). ClaimsJWTAuthentication строит по ним пользователя без
+запроса к базе, если они совпадают с данными пользователя в кеше.
+Кеш обновляется при каждом сохранении пользователя, поэтому смена роли
+или блокировка сразу отключают быстрый путь для выданных ранее токенов.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+USER_CLAIMS = 'user_claims'
+USER_CLAIMS_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+USER_CLAIMS_KEY = 'user-claims:{}'
+
+
+def get_user_claims(user):
+    return [getattr(user, field) for field in USER_CLAIMS_FIELDS]
+
+
+def remember_user_claims(user):
+    """Запоминает актуальные данные пользователя для сверки токенов."""
+    cache.set(
+        USER_CLAIMS_KEY.format(user.pk),
+        get_user_claims(user),
+        settings.USER_CLAIMS_CACHE_TIMEOUT
+    )
+
+
+def forget_user_claims(user_id):
+    cache.delete(USER_CLAIMS_KEY.format(user_id))
+
+
+def get_remembered_claims(user_id):
+    return cache.get(USER_CLAIMS_KEY.format(user_id))
+
+
+class UserClaimsMixin:
+    """Добавляет данные пользователя в токен при его выпуске."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USER_CLAIMS] = get_user_claims(user)
+        return token
+
+
+class UserAccessToken(UserClaimsMixin, AccessToken):
+    pass
+
+
+class UserRefreshToken(UserClaimsMixin, RefreshToken):
+    pass
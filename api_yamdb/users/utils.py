@@ -1,14 +1,90 @@
+from datetime import timedelta
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
 
 
 def send_conf_code(email, conf_code):
-    "Функция-шорткат для отправки письма."
-    send_mail(
+    "Функция-шорткат для постановки письма с кодом в очередь."
+    OutgoingEmail.objects.create(
+        recipient=email,
         subject='[YaMDB] Код подтверждения',
-        message=('Добрый день!\n'
-                 f'Ваш код подтверждения - {conf_code}'),
-        from_email=settings.EMAIL_SENDER_ADRESS,
-        recipient_list=[email],
-        fail_silently=True,
+        body=('Добрый день!\n'
+              f'Ваш код подтверждения - {conf_code}'),
+    )
+
+
+def get_retry_delay(attempts):
+    "Пауза перед следующей попыткой: удваивается с каждой неудачей."
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
     )
+
+
+def claim_emails(batch_size):
+    '''Забирает из очереди пачку писем, которым пора отправляться.
+
+    Время следующей попытки сдвигается на EMAIL_OUTBOX_LEASE, поэтому
+    другой обработчик не возьмёт те же письма, а письма упавшего
+    обработчика вернутся в очередь после этого срока.
+    '''
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(OutgoingEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(next_attempt__lte=now)[:batch_size])
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE
+        ))
+    return emails
+
+
+def send_emails(batch_size=None):
+    '''Отправляет одну пачку писем через одно соединение.
+
+    Отправленные письма удаляются из очереди, неотправленные получают
+    новую попытку с растущей паузой, а после EMAIL_OUTBOX_MAX_ATTEMPTS
+    попыток остаются в очереди без времени следующей попытки.
+    Возвращает число отправленных и неотправленных писем.
+    '''
+    emails = claim_emails(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, settings.EMAIL_SENDER_ADRESS,
+                    [email.recipient], connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    failed.append((email, error))
+                else:
+                    sent.append(email.pk)
+    except Exception as error:
+        # Соединение не открылось или оборвалось: неотправленные письма
+        # считаются неудачной попыткой.
+        done = set(sent) | {email.pk for email, _ in failed}
+        failed.extend(
+            (email, error) for email in emails if email.pk not in done
+        )
+    OutgoingEmail.objects.filter(pk__in=sent).delete()
+    now = timezone.now()
+    for email, error in failed:
+        email.attempts += 1
+        email.last_error = repr(error)
+        email.next_attempt = (
+            now + get_retry_delay(email.attempts)
+            if email.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS else None
+        )
+        email.save(update_fields=['attempts', 'last_error', 'next_attempt'])
+    return len(sent), len(failed)
@@ -1,42 +1,67 @@
+from django.db import IntegrityError, transaction
 from rest_framework import filters, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.cache import ConditionalGetMixin
+from api.pagination import UserPagination
+from api.throttling import (AuthIPThrottle, SignupIdentityThrottle,
+                            TokenIdentityThrottle)
 
 from .models import CustomUser
 from .permissions import IsAdmin
 from .serializers import UserCodeSerializer, UserJWTSerializer, UserSerializer
+from .tokens import UserRefreshToken
 from .utils import send_conf_code
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, SignupIdentityThrottle])
 def obtain_confirmation_code(request):
     '''API-view функция регистрации пользователя.
 
     Ожидает на вход поля username и email.
     В качестве ответа на запрос возвращает поля username и email.
-    Отправляет пользователю код подтверждения на почту и
-    Сохраняет его в базу данных для последующей сверки.
+    Сохраняет код подтверждения в базу данных для последующей сверки
+    и ставит письмо с ним в очередь (см. команду send_emails).
     '''
-    user = CustomUser.objects.filter(username=request.data.get('username'),
-                                     email=request.data.get('email'))
-    if user.first():
-        serializer = UserCodeSerializer(user.first(), data=request.data)
-    else:
-        serializer = UserCodeSerializer(data=request.data)
-
+    serializer = UserCodeSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    send_conf_code(serializer.validated_data.get('email'),
-                   serializer.validated_data.get('confirmation_code'))
-    serializer.save()
+    try:
+        save_confirmation_code(serializer)
+    except IntegrityError:
+        # Пользователь с тем же username или email создан параллельным
+        # запросом: повторная проверка найдёт его.
+        serializer = UserCodeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        save_confirmation_code(serializer)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+def save_confirmation_code(serializer):
+    '''Сохраняет новый код подтверждения и ставит письмо в очередь.
+
+    Пользователь, найденный при валидации, получает новый код, иначе
+    создаётся новый пользователь. Письмо ставится в очередь в той же
+    транзакции, поэтому код не останется без письма и наоборот.
+    '''
+    validated_data = dict(serializer.validated_data)
+    user = validated_data.pop('user')
+    with transaction.atomic():
+        if user is None:
+            serializer.create(validated_data)
+        else:
+            serializer.update(user, validated_data)
+        send_conf_code(validated_data['email'],
+                       validated_data['confirmation_code'])
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, TokenIdentityThrottle])
 def get_jwt_token(request):
     '''API-view функция отправки JWT-кода.
 
@@ -45,14 +70,12 @@ def get_jwt_token(request):
     '''
     serializer = UserJWTSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user = CustomUser.objects.get(
-        username=serializer.validated_data.get('username'))
-    refresh = RefreshToken.for_user(user)
+    refresh = UserRefreshToken.for_user(serializer.validated_data['user'])
     response_data = {'token': str(refresh.access_token)}
     return Response(response_data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     '''API-viewset класс для обработки запросов по модели пользователя.
 
     Обрабатывает следующие эндпоинты:
@@ -64,10 +87,11 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = LimitOffsetPagination
+    pagination_class = UserPagination
     filter_backends = (filters.SearchFilter, )
     search_fields = ('username', )
     lookup_field = 'username'
+    cache_models = (CustomUser,)
 
     def partial_update(self, request, *args, **kwargs):
         kwargs['partial'] = True
@@ -79,6 +103,7 @@ class UserViewSet(viewsets.ModelViewSet):
             permission_classes=[IsAuthenticated])
     def user_profile(self, request):
         if request.method == 'PATCH':
+            self.load_profile(request)
             serializer = UserSerializer(request.user,
                                         data=request.data,
                                         partial=True)
@@ -87,5 +112,15 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+        return self.cached_response(self.get_profile, request)
+
+    def load_profile(self, request):
+        """Догружает поля пользователя, построенного из токена."""
+        deferred = request.user.get_deferred_fields()
+        if deferred:
+            request.user.refresh_from_db(fields=deferred)
+
+    def get_profile(self, request):
+        self.load_profile(request)
         serializer = self.get_serializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
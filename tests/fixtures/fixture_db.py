@@ -0,0 +1,33 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+
+
+@pytest.fixture
+def file_db(transactional_db, tmp_path):
+    """Копия тестовой базы SQLite в файле на время теста.
+
+    База в памяти с общим кешем сразу отказывает в записи другим
+    соединениям, а тестам одновременных запросов нужна обычная
+    блокировка с ожиданием, как у рабочей базы. Созданные до этой
+    фикстуры объекты копируются в файл.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    connection.ensure_connection()
+    path = str(tmp_path / 'test.sqlite3')
+    with sqlite3.connect(path) as target:
+        connection.connection.backup(target)
+    target.close()
+    memory_connection, connection.connection = connection.connection, None
+    name = connection.settings_dict['NAME']
+    # settings_dict общий для соединений всех потоков.
+    connection.settings_dict['NAME'] = path
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = name
+        connection.connection = memory_connection
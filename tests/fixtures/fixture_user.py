@@ -1,6 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import AccessToken
+
+from users.tokens import UserAccessToken
 
 
 @pytest.fixture
@@ -49,7 +50,7 @@ def user(django_user_model):
 
 @pytest.fixture
 def token_user_superuser(user_superuser):
-    token = AccessToken.for_user(user_superuser)
+    token = UserAccessToken.for_user(user_superuser)
     return {
         'access': str(token),
     }
@@ -66,7 +67,7 @@ def user_superuser_client(token_user_superuser):
 
 @pytest.fixture
 def token_admin(admin):
-    token = AccessToken.for_user(admin)
+    token = UserAccessToken.for_user(admin)
     return {
         'access': str(token),
     }
@@ -81,7 +82,7 @@ def admin_client(token_admin):
 
 @pytest.fixture
 def token_moderator(moderator):
-    token = AccessToken.for_user(moderator)
+    token = UserAccessToken.for_user(moderator)
     return {
         'access': str(token),
     }
@@ -98,7 +99,7 @@ def moderator_client(token_moderator):
 
 @pytest.fixture
 def token_user(user):
-    token = AccessToken.for_user(user)
+    token = UserAccessToken.for_user(user)
     return {
         'access': str(token),
     }
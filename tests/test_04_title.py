@@ -11,6 +11,14 @@ class Test04TitleAPI:
 
     TITLES_URL = '/api/v1/titles/'
     TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # Количество запросов не должно зависеть от размера страницы:
+    # COUNT для пагинации, выборка произведений с категориями и жанры.
+    TITLES_LIST_QUERIES = 3
+    TITLES_DETAIL_QUERIES = 2
+    # Запись не должна зависеть от числа жанров: жанры и категория по
+    # одному запросу, вставка произведения и связей, пометка для пересчёта
+    # похожих произведений. Пользователь берётся из токена без запроса.
+    TITLE_CREATE_QUERIES = 8
 
     def test_01_title_not_auth(self, client):
         response = client.get(self.TITLES_URL)
@@ -351,3 +359,96 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    @pytest.mark.parametrize('titles_count', (1, 5, 15))
+    def test_07_titles_list_query_count(self, client,
+                                        django_assert_num_queries,
+                                        titles_count):
+        from reviews.models import Category, Genre, Title
+
+        genres = [Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{idx}')
+                  for idx in range(3)]
+        category = Category.objects.create(name='Фильм', slug='films')
+        for idx in range(titles_count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+        with django_assert_num_queries(self.TITLES_LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert all(
+            len(title['genre']) == len(genres) and title['category']
+            for title in data['results']
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'содержит жанры и категорию каждого произведения.'
+        )
+
+        with django_assert_num_queries(self.TITLES_DETAIL_QUERIES):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.parametrize('genres_count', (1, 5, 20))
+    def test_08_title_write_query_count(self, admin_client,
+                                        django_assert_num_queries,
+                                        genres_count):
+        from reviews.models import Category, Genre
+
+        Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx:02}', slug=f'genre{idx}')
+            for idx in reversed(range(genres_count))
+        ]
+        data = {
+            'name': 'Произведение',
+            'year': 2000,
+            'genre': [genre.slug for genre in genres],
+            'category': 'films',
+        }
+        with django_assert_num_queries(self.TITLE_CREATE_QUERIES):
+            response = admin_client.post(
+                self.TITLES_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['genre'] == [
+            {'name': genre.name, 'slug': genre.slug}
+            for genre in reversed(genres)
+        ], (
+            f'Проверьте, что ответ на POST-запрос к `{self.TITLES_URL}` '
+            'содержит все жанры произведения, упорядоченные по названию.'
+        )
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=response.json()['id']
+        )
+        assert admin_client.get(detail_url).json() == response.json()
+
+    def test_09_title_unknown_slugs(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Произведение',
+            'year': 2000,
+            'genre': [genres[0]['slug'], 'unknown', 'missing'],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.TITLES_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()['genre']
+        assert len(errors) == 2 and all(
+            slug in error
+            for slug, error in zip(('unknown', 'missing'), errors)
+        ), (
+            f'Проверьте, что при POST-запросе к `{self.TITLES_URL}` с '
+            'несуществующими слагами жанров в ответе перечислены все '
+            'неизвестные слаги.'
+        )
+
+        data['genre'] = [genres[0]['slug']]
+        data['category'] = 'unknown'
+        response = admin_client.post(self.TITLES_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'category' in response.json()
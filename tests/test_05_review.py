@@ -3,8 +3,8 @@ from http import HTTPStatus
 import pytest
 from django.db.utils import IntegrityError
 
-from tests.utils import (check_fields, check_pagination, create_reviews,
-                         create_single_review, create_titles)
+from tests.utils import (check_fields, check_pagination, create_authors,
+                         create_reviews, create_single_review, create_titles)
 
 
 @pytest.mark.django_db(transaction=True)
@@ -15,6 +15,8 @@ class Test05ReviewAPI:
     REVIEW_DETAIL_URL_TEMPLATE = (
         '/api/v1/titles/{title_id}/reviews/{review_id}/'
     )
+    # Произведение, COUNT для пагинации и отзывы вместе с авторами.
+    REVIEWS_LIST_QUERIES = 3
 
     def test_01_review_not_auth(self, client, admin_client, admin, user_client,
                                 user, moderator_client, moderator):
@@ -411,3 +413,23 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    @pytest.mark.parametrize('reviews_count', (1, 5, 15))
+    def test_07_reviews_list_query_count(self, client, admin_client,
+                                         django_user_model,
+                                         django_assert_num_queries,
+                                         reviews_count):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        Review.objects.bulk_create(
+            Review(author=author, title_id=titles[0]['id'], text='text',
+                   score=5)
+            for author in create_authors(django_user_model, reviews_count)
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with django_assert_num_queries(self.REVIEWS_LIST_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert all(review['author'] for review in response.json()['results'])
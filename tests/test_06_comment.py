@@ -2,8 +2,9 @@ from http import HTTPStatus
 
 import pytest
 
-from tests.utils import (check_fields, check_pagination, create_comments,
-                         create_reviews, create_single_comment)
+from tests.utils import (check_fields, check_pagination, create_authors,
+                         create_comments, create_reviews,
+                         create_single_comment)
 
 
 @pytest.mark.django_db(transaction=True)
@@ -14,6 +15,8 @@ class Test06CommentAPI:
     COMMENT_DETAIL_URL_TEMPLATE = (
         '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
     )
+    # Отзыв, COUNT для пагинации и комментарии вместе с авторами.
+    COMMENTS_LIST_QUERIES = 3
 
     def test_01_comment_not_auth(self, client, admin_client, admin,
                                  user_client, user, moderator_client,
@@ -366,3 +369,26 @@ class Test06CommentAPI:
             f'Проверьте, что PUT-запрос к `{self.COMMENT_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    @pytest.mark.parametrize('comments_count', (1, 5, 15))
+    def test_08_comments_list_query_count(self, client, admin_client, admin,
+                                          django_user_model,
+                                          django_assert_num_queries,
+                                          comments_count):
+        from reviews.models import Comment
+
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        Comment.objects.bulk_create(
+            Comment(author=author, review_id=reviews[0]['id'], text='text')
+            for author in create_authors(django_user_model, comments_count)
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        with django_assert_num_queries(self.COMMENTS_LIST_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            comment['author'] for comment in response.json()['results']
+        )
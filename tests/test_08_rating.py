@@ -0,0 +1,104 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+from tests.utils import create_reviews, create_titles
+
+
+def get_avg_ratings():
+    from reviews.models import Title
+
+    return {
+        title.pk: title.avg_rating
+        for title in Title.objects.annotate(avg_rating=Avg('reviews__score'))
+    }
+
+
+def get_stored_ratings():
+    from reviews.models import Title
+
+    return {title.pk: title.rating for title in Title.objects.all()}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user,
+                                              moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        assert get_stored_ratings() == get_avg_ratings(), (
+            'Проверьте, что при создании отзыва сохранённый рейтинг '
+            'произведения совпадает со средней оценкой отзывов.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        response = user_client.patch(review_url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert get_stored_ratings() == get_avg_ratings(), (
+            'Проверьте, что при изменении оценки отзыва сохранённый рейтинг '
+            'произведения пересчитывается.'
+        )
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.json().get('rating') == 6, (
+            'Проверьте, что поле `rating` в ответе на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` учитывает изменённую оценку.'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert get_stored_ratings() == get_avg_ratings(), (
+            'Проверьте, что при удалении отзыва сохранённый рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        for review in reviews[::2]:
+            admin_client.delete(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=review['id']
+            ))
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов поле `rating` '
+            'произведения снова равно `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin, user,
+                                        moderator):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        Review.objects.bulk_create(
+            Review(author=author, title_id=title['id'], text='bulk',
+                   score=score)
+            for title in titles
+            for author, score in ((admin, 3), (user, 8), (moderator, 10))
+        )
+        Title.objects.filter(pk=titles[1]['id']).update(
+            rating_sum=100, rating_count=1
+        )
+        assert get_stored_ratings() != get_avg_ratings()
+
+        call_command('rebuild_ratings', stdout=StringIO())
+        assert get_stored_ratings() == get_avg_ratings(), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'сохранённые рейтинги так же, как агрегация Avg().'
+        )
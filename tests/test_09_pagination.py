@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_authors, create_titles
+
+
+def collect_cursor_pages(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert 'count' not in data, (
+        f'Проверьте, что в режиме курсоров ответ на GET-запрос к `{url}` '
+        'не содержит ключ `count`.'
+    )
+    pages = [data['results']]
+    while data['next']:
+        data = client.get(data['next']).json()
+        pages.append(data['results'])
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_titles_cursor(self, client):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx:02}', year=2000)
+            for idx in range(25)
+        )
+
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 25, (
+            f'Проверьте, что по умолчанию `{self.TITLES_URL}` использует '
+            'постраничную пагинацию с ключом `count`.'
+        )
+
+        pages = collect_cursor_pages(
+            client, f'{self.TITLES_URL}?pagination=cursor'
+        )
+        names = [title['name'] for page in pages for title in page]
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert names == sorted(
+            Title.objects.values_list('name', flat=True)
+        ), (
+            f'Проверьте, что курсоры `{self.TITLES_URL}` обходят все '
+            'произведения в порядке названия без повторов и пропусков.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client,
+                               django_user_model):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        for author in create_authors(django_user_model, 15):
+            Review.objects.create(
+                author=author, title_id=titles[0]['id'], text='text', score=5
+            )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        pages = collect_cursor_pages(client, f'{url}?pagination=cursor')
+        ids = [review['id'] for page in pages for review in page]
+        assert ids == list(
+            Review.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        ), (
+            f'Проверьте, что курсоры `{self.REVIEWS_URL_TEMPLATE}` обходят '
+            'отзывы от новых к старым.'
+        )
+
+        first_page = client.get(f'{url}?pagination=cursor').json()
+        data = client.get(first_page['next']).json()
+        assert data['previous'], (
+            'Проверьте, что вторая страница в режиме курсоров содержит '
+            'ссылку `previous`.'
+        )
+        previous = client.get(data['previous']).json()
+        assert [review['id'] for review in previous['results']] == ids[:10]
+
+    def test_03_users_cursor(self, admin_client, django_user_model):
+        create_authors(django_user_model, 12)
+
+        response = admin_client.get(f'{self.USERS_URL}?limit=5&offset=5')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 13, (
+            f'Проверьте, что по умолчанию `{self.USERS_URL}` использует '
+            'пагинацию limit/offset.'
+        )
+
+        pages = collect_cursor_pages(
+            admin_client, f'{self.USERS_URL}?pagination=cursor'
+        )
+        usernames = [user['username'] for page in pages for user in page]
+        assert usernames == sorted(
+            django_user_model.objects.values_list('username', flat=True)
+        )
@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CatalogCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_anonymous_hit_without_queries(self, client, admin_client,
+                                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        for url in (
+                self.TITLES_URL,
+                f'{self.TITLES_URL}?year=1984&genre=horror',
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                ),
+                self.GENRES_URL,
+                self.CATEGORIES_URL,
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            with django_assert_num_queries(0):
+                cached = client.get(url)
+            assert cached.status_code == HTTPStatus.OK
+            assert cached.content == response.content, (
+                f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+                'возвращает закешированный ответ без обращения к базе.'
+            )
+
+        with django_assert_num_queries(0):
+            response = client.get(f'{self.TITLES_URL}?genre=horror&year=1984')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ключ кеша не зависит от порядка параметров.'
+        )
+
+    def test_02_authenticated_requests_bypass_cache(self, client,
+                                                    admin_client):
+        create_titles(admin_client)
+        client.get(self.GENRES_URL)
+        response = admin_client.get(self.GENRES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3
+
+    def test_03_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        client.get(self.TITLES_URL)
+        client.get(self.GENRES_URL)
+        client.get(self.CATEGORIES_URL)
+        assert client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведений.'
+        )
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что изменение жанров произведения сбрасывает кеш.'
+        )
+
+        admin_client.post(self.GENRES_URL, data={'name': 'Мюзикл',
+                                                 'slug': 'musical'})
+        assert client.get(self.GENRES_URL).json()['count'] == 4, (
+            'Проверьте, что создание жанра сбрасывает кеш жанров.'
+        )
+
+        admin_client.delete(f'{self.CATEGORIES_URL}films/')
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 1, (
+            'Проверьте, что удаление категории сбрасывает кеш категорий.'
+        )
+        assert client.get(detail_url).json()['category'] is None
+
+        admin_client.delete(detail_url)
+        assert client.get(detail_url).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(self.TITLES_URL).json()['count'] == 1
+
+    def test_04_rolled_back_write_keeps_cache(self, client, admin_client,
+                                              django_assert_num_queries):
+        from django.db import transaction
+
+        from api.cache import get_generations
+        from reviews.models import Genre
+
+        create_titles(admin_client)
+        response = client.get(self.GENRES_URL)
+        generations = get_generations([Genre])
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Genre.objects.create(name='Откат', slug='rollback')
+                assert get_generations([Genre]) == generations, (
+                    'Проверьте, что поколение модели меняется только после '
+                    'фиксации транзакции.'
+                )
+                raise RuntimeError
+
+        assert get_generations([Genre]) == generations
+        with django_assert_num_queries(0):
+            cached = client.get(self.GENRES_URL)
+        assert (cached['ETag'], cached.content) == (
+            response['ETag'], response.content
+        ), (
+            'Проверьте, что откаченная запись не меняет ETag и '
+            'закешированный ответ.'
+        )
+
+    def test_05_rebuild_commands_invalidate_cache(self, client, admin):
+        from django.core.management import call_command
+
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url)
+        assert response.json()['rating'] is None
+
+        Review.objects.bulk_create([
+            Review(title=title, author=admin, text='Отзыв', score=9)
+        ])
+        call_command('rebuild_ratings')
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что команда `rebuild_ratings` меняет ETag '
+            'произведений.'
+        )
+        assert response.json()['rating'] == 9, (
+            'Проверьте, что после команды `rebuild_ratings` анонимный '
+            'запрос не получает закешированный ответ со старым рейтингом.'
+        )
@@ -0,0 +1,187 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review
+
+
+def get_with_queries(client, url, **headers):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, **headers)
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def test_01_reviews_not_modified(self, client, admin_client, admin,
+                                     user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response, full_queries = get_with_queries(client, url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` содержит заголовки `ETag` и '
+            '`Last-Modified`.'
+        )
+
+        response, queries = get_with_queries(
+            client, url, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос с совпадающим `If-None-Match` к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        assert response.get('ETag') == etag and response.get(
+            'Last-Modified'
+        ), (
+            'Проверьте, что ответ 304 содержит те же заголовки `ETag` и '
+            '`Last-Modified`, что и ответ 200.'
+        )
+        assert queries < full_queries, (
+            'Проверьте, что ответ 304 формируется без выборки и '
+            'сериализации отзывов.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[1]['id']
+            ),
+            data={'text': 'Изменённый текст'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва старый `ETag` перестаёт '
+            'совпадать и возвращается полный ответ.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_comments_and_title_not_modified(self, client, admin_client,
+                                                admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        # If-Modified-Since не привязан к адресу, поэтому перед ответом
+        # 304 проверяется существование отзыва для комментариев. Для
+        # произведения его доказывает анонимный ответ, уже лежащий в кеше.
+        for url, expected_queries in (
+                (self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0]['id']
+                ), 1),
+                (self.TITLE_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                ), 0),
+        ):
+            response = client.get(url)
+            response, queries = get_with_queries(
+                client, url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since` '
+                'не раньше `Last-Modified` возвращает ответ со статусом 304.'
+            )
+            assert queries == expected_queries, (
+                f'Проверьте, что ответ 304 на GET-запрос к `{url}` только '
+                'проверяет существование объектов из URL.'
+            )
+
+    def test_03_users_me_not_modified(self, user_client):
+        response, full_queries = get_with_queries(
+            user_client, self.USERS_ME_URL
+        )
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        response, queries = get_with_queries(
+            user_client, self.USERS_ME_URL, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert (queries, full_queries) == (0, 1), (
+            f'Проверьте, что ответ 304 на `{self.USERS_ME_URL}` не обращается '
+            'к базе, а полный ответ догружает профиль одним запросом.'
+        )
+
+        user_client.patch(self.USERS_ME_URL, data={'bio': 'Новое о себе'})
+        response = user_client.get(
+            self.USERS_ME_URL, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == 'Новое о себе'
+
+    def test_04_missing_objects_not_modified(self, client, admin_client,
+                                             admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        for url in (
+                self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=999),
+                self.REVIEWS_URL_TEMPLATE.format(title_id=999),
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=999
+                ),
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=999, review_id=review_id
+                ),
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=999
+                ),
+        ):
+            for headers in (
+                    {'HTTP_IF_MODIFIED_SINCE': future},
+                    {'HTTP_IF_NONE_MATCH': '*'},
+                    {'HTTP_IF_NONE_MATCH': response['ETag']},
+            ):
+                assert client.get(url, **headers).status_code == (
+                    HTTPStatus.NOT_FOUND
+                ), (
+                    f'Проверьте, что GET-запрос к несуществующему `{url}` '
+                    'возвращает 404 и с заголовками условного запроса.'
+                )
+
+    def test_05_post_validators_scoped(self, client, admin_client, admin,
+                                       user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+
+        client.post('/api/v1/auth/signup/', data={
+            'username': user.username, 'email': user.email
+        })
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 7)
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что `ETag` ответа на `{url}` не меняется после '
+                'запроса кода подтверждения и отзыва на другое произведение.'
+            )
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что отзыв на то же произведение меняет `ETag` '
+                f'ответа на `{url}`.'
+            )
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query, **filters):
+        params = {'search': query, **filters}
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_words_and_prefixes(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('терминатор', 'ТЕРМИНАТОР', 'термин', 'орешек крепкий'):
+            assert self.search(client, query) in (
+                ['Терминатор'], ['Крепкий орешек']
+            ), (
+                f'Проверьте, что поиск `{self.TITLES_URL}?search={query}` '
+                'находит произведение без учёта регистра, порядка слов и '
+                'окончаний.'
+            )
+        assert self.search(client, 'орешек терминатор') == [], (
+            'Проверьте, что при поиске должны совпасть все слова запроса.'
+        )
+        assert self.search(client, '"*) OR (') == []
+
+    def test_02_search_ranked_and_filtered(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Back to the Future',
+            'year': 1985,
+            'genre': [genres[1]['slug']],
+            'category': 'films',
+            'description': 'Roads? Where we are going we do not need roads.'
+        })
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Road House',
+            'year': 1989,
+            'genre': [genres[0]['slug']],
+            'category': 'films',
+            'description': 'Pain don`t hurt.'
+        })
+        assert self.search(client, 'road') == [
+            'Road House', 'Back to the Future'
+        ], (
+            'Проверьте, что результаты поиска упорядочены по релевантности: '
+            'совпадения в названии выше совпадений в описании.'
+        )
+        assert self.search(
+            client, 'road', genre=genres[1]['slug']
+        ) == ['Back to the Future'], (
+            'Проверьте, что поиск сочетается с фильтрацией по жанру.'
+        )
+        assert self.search(client, 'road', year=1989) == ['Road House']
+
+    def test_03_search_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        admin_client.patch(url, data={'name': 'Чужой'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+
+        admin_client.delete(url)
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что удалённое произведение пропадает из поиска.'
+        )
@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_comment, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13PostSearch:
+
+    REVIEWS_SEARCH_URL = '/api/v1/search/reviews/'
+    COMMENTS_SEARCH_URL = '/api/v1/search/comments/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @pytest.fixture
+    def posts(self, admin_client, user_client, user, admin):
+        from reviews.models import Title
+
+        first = Title.objects.create(name='Терминатор', year=1984)
+        second = Title.objects.create(name='Чужой', year=1979)
+        reviews = [
+            create_single_review(
+                user_client, first.id, 'Ужасный робот, ужасные спецэффекты', 2
+            ).json(),
+            create_single_review(
+                admin_client, first.id, 'Отличный боевик про робота', 9
+            ).json(),
+            create_single_review(
+                user_client, second.id, 'Страшный космический ужас', 8
+            ).json(),
+        ]
+        comments = [
+            create_single_comment(
+                admin_client, first.id, reviews[0]['id'],
+                'Роботы тут не ужасные'
+            ).json(),
+            create_single_comment(
+                user_client, second.id, reviews[2]['id'], 'Согласен, жуть'
+            ).json(),
+        ]
+        return [first, second], reviews, comments
+
+    def test_01_search_permissions(self, client, user_client,
+                                   moderator_client, admin_client):
+        for url in (self.REVIEWS_SEARCH_URL, self.COMMENTS_SEARCH_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что поиск `{url}` недоступен пользователю с '
+                'ролью `user`.'
+            )
+            for staff_client in (moderator_client, admin_client):
+                assert staff_client.get(url).status_code == HTTPStatus.OK
+
+    def test_02_search_reviews(self, moderator_client, posts, user):
+        titles, reviews, _ = posts
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL, {'search': 'робот'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 2, (
+            f'Проверьте, что `{self.REVIEWS_SEARCH_URL}?search=` находит '
+            'отзывы по словам из текста, в том числе по началу слова.'
+        )
+        assert {review['title'] for review in data['results']} == {
+            titles[0].id
+        }
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL,
+            {'search': 'ужас', 'author': user.username}
+        )
+        ids = [review['id'] for review in response.json()['results']]
+        assert ids == [reviews[0]['id'], reviews[2]['id']], (
+            'Проверьте, что поиск по отзывам сочетается с фильтром по автору '
+            'и упорядочен по релевантности.'
+        )
+
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL, {'search': 'ужас', 'title': titles[1].id}
+        )
+        assert [
+            review['id'] for review in response.json()['results']
+        ] == [reviews[2]['id']]
+
+    def test_03_search_comments(self, admin_client, posts):
+        titles, reviews, comments = posts
+
+        response = admin_client.get(
+            self.COMMENTS_SEARCH_URL, {'search': 'ужасные роботы'}
+        )
+        data = response.json()
+        assert [comment['id'] for comment in data['results']] == [
+            comments[0]['id']
+        ], (
+            f'Проверьте, что `{self.COMMENTS_SEARCH_URL}?search=` находит '
+            'комментарии по тексту.'
+        )
+        assert data['results'][0]['title'] == titles[0].id
+        assert data['results'][0]['review'] == reviews[0]['id']
+
+        response = admin_client.get(
+            self.COMMENTS_SEARCH_URL, {'title': titles[1].id}
+        )
+        assert response.json()['count'] == 1
+
+    def test_04_search_index_follows_changes(self, user_client,
+                                             moderator_client, posts):
+        titles, reviews, _ = posts
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0].id, review_id=reviews[0]['id']
+        )
+
+        user_client.patch(url, data={'text': 'Передумал, шедевр'})
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL, {'search': 'шедевр'}
+        )
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'текста отзыва.'
+        )
+
+        user_client.delete(url)
+        response = moderator_client.get(
+            self.REVIEWS_SEARCH_URL, {'search': 'шедевр'}
+        )
+        assert response.json()['count'] == 0
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Typeahead:
+
+    TYPEAHEAD_URL = '/api/v1/typeahead/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def suggest(self, client, query, **params):
+        response = client.get(self.TYPEAHEAD_URL, {'q': query, **params})
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_typeahead_matches_word_prefixes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        data = self.suggest(client, 'кре')
+        assert data['titles'] == [{
+            'id': titles[1]['id'], 'name': 'Крепкий орешек', 'year': 1988
+        }], (
+            f'Проверьте, что `{self.TYPEAHEAD_URL}?q=` находит произведения '
+            'по началу названия.'
+        )
+        assert self.suggest(client, 'ОРЕ')['titles'][0]['name'] == (
+            'Крепкий орешек'
+        ), (
+            f'Проверьте, что `{self.TYPEAHEAD_URL}?q=` находит произведения '
+            'по началу любого слова без учёта регистра.'
+        )
+
+        data = self.suggest(client, 'ко')
+        assert data['genres'] == [{'name': 'Комедия', 'slug': 'comedy'}]
+        assert data['categories'] == []
+        assert self.suggest(client, 'кни')['categories'] == [
+            {'name': 'Книги', 'slug': 'books'}
+        ]
+        assert self.suggest(client, '') == {
+            'titles': [], 'genres': [], 'categories': []
+        }
+
+    def test_02_typeahead_limit_and_queries(self, client,
+                                            django_assert_num_queries):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Звёздные войны {idx}', year=1977) for idx in range(30)
+        )
+        self.suggest(client, 'зв')
+
+        with django_assert_num_queries(0):
+            data = self.suggest(client, 'звезд', limit=5)
+        assert len(data['titles']) == 5, (
+            'Проверьте, что подсказки берутся из индекса в памяти без '
+            'обращения к базе и ограничены параметром `limit`.'
+        )
+        assert len(self.suggest(client, 'войны', limit=1000)['titles']) == 30
+
+    def test_03_typeahead_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.suggest(client, 'терм')['titles']
+
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        admin_client.patch(url, data={'name': 'Чужой'})
+        assert self.suggest(client, 'терм')['titles'] == []
+        assert self.suggest(client, 'чуж')['titles'][0]['name'] == 'Чужой', (
+            'Проверьте, что индекс подсказок обновляется при изменении '
+            'названия произведения.'
+        )
+
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Мюзикл', 'slug': 'musical'
+        })
+        assert self.suggest(client, 'мюз')['genres'] == [
+            {'name': 'Мюзикл', 'slug': 'musical'}
+        ]
+
+        admin_client.delete(url)
+        assert self.suggest(client, 'чуж')['titles'] == [], (
+            'Проверьте, что удалённое произведение пропадает из подсказок.'
+        )
+
+    def test_04_rolled_back_write_not_suggested(self, client, admin_client):
+        from django.db import transaction
+
+        from reviews.models import Genre, Title
+
+        create_titles(admin_client)
+        self.suggest(client, 'фа')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.create(name='Фантом', year=2000)
+                Genre.objects.create(name='Фантастика', slug='fantasy')
+                raise RuntimeError
+        data = self.suggest(client, 'фа')
+        assert data['titles'] == [] and data['genres'] == [], (
+            'Проверьте, что объекты из откаченной транзакции не попадают '
+            'в подсказки.'
+        )
+
+        Title.objects.create(name='Фантом', year=2000)
+        assert [
+            title['name'] for title in self.suggest(client, 'фа')['titles']
+        ] == ['Фантом'], (
+            'Проверьте, что после фиксации изменение сразу попадает в '
+            'подсказки.'
+        )
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса проверяется на SQLite'
+)
+class Test15QueryPlans:
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+        assert f'USING INDEX {index_name}' in plan, (
+            f'Проверьте, что запрос использует индекс `{index_name}`. '
+            f'План запроса:\n{plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что для сортировки результатов не строится временное '
+            f'B-дерево. План запроса:\n{plan}'
+        )
+
+    def test_01_title_indexes(self):
+        from reviews.models import Title
+
+        queryset = Title.objects.select_related('category')
+        self.assert_uses_index(queryset.order_by('name'), 'title_name_idx')
+        self.assert_uses_index(
+            queryset.order_by('name', 'id'), 'title_name_idx'
+        )
+        self.assert_uses_index(Title.objects.all(), 'title_year_idx')
+        self.assert_uses_index(
+            Title.objects.filter(year=1984), 'title_year_idx'
+        )
+
+    def test_02_post_indexes(self):
+        from reviews.models import Review, Title
+
+        title, review = Title(pk=1), Review(pk=1)
+        reviews = title.reviews.select_related('author')
+        comments = review.comments.select_related('author')
+        for queryset, index_name in (
+            (reviews, 'review_title_pub_date_idx'),
+            (comments, 'comment_review_pub_date_idx'),
+        ):
+            self.assert_uses_index(queryset, index_name)
+            self.assert_uses_index(
+                queryset.order_by('-pub_date', '-id'), index_name
+            )
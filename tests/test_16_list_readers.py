@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_authors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ListReaders:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        from reviews.models import (Category, Comment, Genre, Review,
+                                    Title)
+
+        authors = create_authors(django_user_model, 3)
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name=name, slug=slug)
+            for name, slug in (('Драма', 'drama'), ('Боевик', 'action'))
+        ]
+        titles = [
+            Title.objects.create(
+                name='Терминатор', year=1984, category=category,
+                description='I`ll be back'
+            ),
+            Title.objects.create(name='Без категории', year=2000),
+        ]
+        titles[0].genre.set(genres)
+        reviews = [
+            Review.objects.create(
+                title=titles[0], author=author, text=f'Отзыв «{score}»',
+                score=score
+            )
+            for author, score in zip(authors, (7, 8, 10))
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='Согласен 👍'
+            )
+        return titles, reviews
+
+    def assert_same_json(self, client, url, serializer_class, queryset):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        expected = JSONRenderer().render({
+            'count': queryset.count(),
+            'next': None,
+            'previous': None,
+            'results': serializer_class(queryset, many=True).data,
+        })
+        assert response.content == expected, (
+            f'Проверьте, что быстрая сериализация списка `{url}` даёт тот же '
+            'JSON, что и сериализатор модели.'
+        )
+
+    def test_01_titles_list_matches_serializer(self, client, catalog):
+        from api.serializers import TitleReaderSerializer
+        from reviews.models import Title
+
+        queryset = Title.objects.order_by('name')
+        self.assert_same_json(
+            client, self.TITLES_URL, TitleReaderSerializer, queryset
+        )
+        assert client.get(self.TITLES_URL).json()['results'][1]['rating'] == 8
+
+    def test_02_posts_list_matches_serializer(self, client, catalog):
+        from api.serializers import CommentSerializer, ReviewSerializer
+
+        titles, reviews = catalog
+        self.assert_same_json(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0].id),
+            ReviewSerializer,
+            titles[0].reviews.all()
+        )
+        self.assert_same_json(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0].id, review_id=reviews[0].id
+            ),
+            CommentSerializer,
+            reviews[0].comments.all()
+        )
+
+    def test_03_list_reader_with_search_and_cursor(self, client, catalog):
+        response = client.get(self.TITLES_URL, {'search': 'терминатор'})
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Терминатор']
+
+        response = client.get(self.TITLES_URL, {'pagination': 'cursor'})
+        data = response.json()
+        assert [title['name'] for title in data['results']] == [
+            'Без категории', 'Терминатор'
+        ]
+        assert data['results'][0]['category'] is None
+        assert data['results'][0]['genre'] == []
+
+    def test_04_readers_match_serializers(self, catalog):
+        from api.readers import (CommentReader, ReviewReader, RowReader,
+                                 TitleReader)
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleReaderSerializer)
+        from reviews.models import Comment, Review, Title
+
+        for reader, serializer_class, queryset in (
+            (TitleReader(), TitleReaderSerializer,
+             Title.objects.select_related('category').order_by('name')),
+            (ReviewReader(), ReviewSerializer,
+             Review.objects.select_related('author').order_by('id')),
+            (CommentReader(), CommentSerializer,
+             Comment.objects.select_related('author').order_by('id')),
+        ):
+            assert reader.serialize(reader.get_rows(queryset)) == (
+                serializer_class(queryset, many=True).data
+            ), (
+                f'Проверьте, что `{type(reader).__name__}` строит для тех же '
+                'строк те же словари, что и сериализатор модели.'
+            )
+
+        with pytest.raises(TypeError):
+            RowReader()
@@ -0,0 +1,125 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleBulk:
+
+    TITLES_URL = '/api/v1/titles/'
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_permissions(self, client, user_client, moderator_client):
+        data = [{'name': 'Произведение', 'year': 2000, 'genre': [],
+                 'category': 'movie'}]
+        assert client.post(
+            self.BULK_URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for other_client in (user_client, moderator_client):
+            response = other_client.post(self.BULK_URL, data=data,
+                                         format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{self.BULK_URL}` доступен только '
+                'администратору.'
+            )
+
+    def test_02_bulk_create_and_update(self, admin_client, client, settings):
+        settings.TITLE_BULK_CHUNK_SIZE = 2
+        titles, categories, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        items = [
+            {'name': 'Чужой', 'year': 1979, 'category': categories[0]['slug'],
+             'genre': [genres[1]['slug'], genres[0]['slug']]},
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['unknown'],
+             'category': categories[0]['slug']},
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': [genres[2]['slug']]},
+            {'name': 'Из будущего', 'year': 3000, 'genre': [],
+             'category': categories[1]['slug']},
+            {'name': 'Матрица', 'year': 1999, 'genre': [],
+             'category': categories[1]['slug'], 'description': 'Ложки нет'},
+            {'id': 100500, 'name': 'Несуществующее'},
+        ]
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [result['status'] for result in data['results']] == [
+            'created', 'invalid', 'updated', 'invalid', 'created', 'invalid'
+        ], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает результат для '
+            'каждого элемента пакета в порядке запроса.'
+        )
+        assert (data['created'], data['updated'], data['invalid']) == (
+            2, 1, 3
+        )
+        assert 'genre' in data['results'][1]['errors']
+        assert 'year' in data['results'][3]['errors']
+        assert 'id' in data['results'][5]['errors']
+
+        for index in (0, 2, 4):
+            title_id = data['results'][index]['id']
+            response = client.get(f'{self.TITLES_URL}{title_id}/')
+            assert response.status_code == HTTPStatus.OK
+            title = response.json()
+            assert title['name'] == items[index]['name'], (
+                'Проверьте, что созданным при массовой записи произведениям '
+                'присвоены правильные id.'
+            )
+            assert sorted(genre['slug'] for genre in title['genre']) == (
+                sorted(items[index]['genre'])
+            )
+        assert data['results'][2]['id'] == titles[0]['id']
+
+        names = {
+            title['name']
+            for title in client.get(self.TITLES_URL).json()['results']
+        }
+        assert {'Чужой', 'Матрица', 'Терминатор 2'} <= names, (
+            'Проверьте, что после массовой записи кеш списка произведений '
+            'сбрасывается.'
+        )
+        response = client.get(self.TITLES_URL, {'search': 'ложки'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Матрица'
+        ]
+        response = client.get('/api/v1/typeahead/', {'q': 'чуж'})
+        assert response.json()['titles'][0]['name'] == 'Чужой'
+
+    def test_03_bulk_ndjson(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        lines = [
+            json.dumps({'name': f'Серия {idx}', 'year': 2000 + idx,
+                        'genre': [genres[0]['slug']],
+                        'category': categories[0]['slug']})
+            for idx in range(3)
+        ]
+        response = admin_client.generic(
+            'POST', self.BULK_URL, '\n'.join(lines) + '\n',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['created'] == 3, (
+            f'Проверьте, что `{self.BULK_URL}` принимает NDJSON.'
+        )
+
+        response = admin_client.generic(
+            'POST', self.BULK_URL, '{"name": "Сломанный",\n',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_invalid_payload(self, admin_client, settings):
+        settings.TITLE_BULK_MAX_ITEMS = 2
+        response = admin_client.post(
+            self.BULK_URL, data={'name': 'Не список'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BULK_URL, data=[{}, {}, {}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.BULK_URL}` ограничивает размер пакета.'
+        )
@@ -0,0 +1,129 @@
+import threading
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReviewRace:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    THREADS = 12
+    # Произведение, BEGIN, блокировка записи, вставка отзыва, обновление
+    # рейтинга, распределения оценок и часовой активности (первый отзыв
+    # создаёт их строки в точках сохранения) - без отдельной проверки
+    # повторного отзыва. Пользователь берётся из токена без запроса.
+    REVIEW_CREATE_QUERIES = 13
+
+    def post_concurrently(self, url, token, data):
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+
+        def post():
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            try:
+                barrier.wait()
+                statuses.append(client.post(url, data=data).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_01_duplicate_review_after_validation(self, user, user_client):
+        from api.views import ReviewViewSet
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        perform_create = ReviewViewSet.perform_create
+
+        def compete(view, serializer):
+            # Параллельный запрос успевает сохранить отзыв после того,
+            # как этот запрос прошёл валидацию.
+            Review.objects.create(
+                title=title, author=user, text='Первый', score=7
+            )
+            perform_create(view, serializer)
+
+        with mock.patch.object(ReviewViewSet, 'perform_create', compete):
+            response = user_client.post(
+                url, data={'text': 'Отзыв', 'score': 3}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв, сохранённый параллельным запросом после '
+            'валидации, приводит к ответу 400, а не к ошибке сервера.'
+        )
+        assert 'non_field_errors' in response.json()
+        title.refresh_from_db()
+        assert title.reviews.count() == 1
+        assert (title.rating_sum, title.rating_count) == (7, 1)
+
+    def test_02_post_transaction_starts_with_write(self, user_client):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                url, data={'text': 'Отзыв', 'score': 7}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        queries = [query['sql'] for query in context.captured_queries]
+        begin = queries.index('BEGIN')
+        assert queries[begin + 1].startswith(
+            f'UPDATE {Review._meta.db_table} '
+        ), (
+            'Проверьте, что транзакция записи отзыва сразу берёт блокировку '
+            'записи: иначе одновременные запросы к SQLite получают '
+            '"database is locked".'
+        )
+
+    def test_03_review_create_queries(self, user_client,
+                                      django_assert_num_queries):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Отзыв', 'score': 7}
+        with django_assert_num_queries(self.REVIEW_CREATE_QUERIES):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'non_field_errors' in response.json(), (
+            'Проверьте, что повторный отзыв на произведение отклоняется '
+            'с ошибкой в `non_field_errors`.'
+        )
+
+    def test_04_concurrent_duplicate_reviews(self, user, token_user,
+                                             file_db):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        statuses = self.post_concurrently(
+            url, token_user['access'], {'text': 'Отзыв', 'score': 7}
+        )
+        assert sorted(statuses) == sorted(
+            [HTTPStatus.CREATED] + [HTTPStatus.BAD_REQUEST] * (
+                self.THREADS - 1
+            )
+        ), (
+            'Проверьте, что при одновременных POST-запросах одного '
+            'пользователя к `/api/v1/titles/{title_id}/reviews/` создаётся '
+            'ровно один отзыв, а остальные запросы получают ответ 400.'
+        )
+        title.refresh_from_db()
+        assert title.reviews.count() == 1
+        assert (title.rating_sum, title.rating_count) == (7, 1)
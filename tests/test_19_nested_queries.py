@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19NestedQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    # Пользователь строится из JWT-токена без запроса к базе.
+    # Для действий с одним объектом родители проверяются тем же запросом,
+    # что ищет сам объект; списку и созданию нужен один запрос к родителю.
+    # Запись отзыва или комментария идёт в транзакции (BEGIN), которая
+    # сразу берёт блокировку записи, вместе с обновлением счётчиков:
+    # рейтинга и распределения оценок или числа комментариев. Исходная
+    # оценка отзыва перечитывается уже под блокировкой. Новая оценка 6
+    # создаёт строку распределения.
+    ACTION_QUERIES = (
+        ('reviews', 'get', 'list', None, 3),
+        ('reviews', 'get', 'detail', None, 1),
+        ('reviews', 'patch', 'detail', {'score': 6}, 11),
+        ('comments', 'get', 'list', None, 3),
+        ('comments', 'get', 'detail', None, 1),
+        ('comments', 'post', 'list', {'text': 'Ответ'}, 5),
+        ('comments', 'patch', 'detail', {'text': 'Исправлено'}, 4),
+        ('comments', 'delete', 'detail', None, 4),
+    )
+
+    @pytest.fixture
+    def posts(self, user):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        other_title = Title.objects.create(name='Чужой', year=1979)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        comment = Comment.objects.create(
+            review=review, author=user, text='Комментарий'
+        )
+        return title, other_title, review, comment
+
+    def get_url(self, kind, target, title, review, comment):
+        if kind == 'reviews':
+            url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            obj_id = review.id
+        else:
+            url = self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            )
+            obj_id = comment.id
+        return url if target == 'list' else f'{url}{obj_id}/'
+
+    @pytest.mark.parametrize(
+        'kind,method,target,data,expected_queries', ACTION_QUERIES
+    )
+    def test_01_action_query_count(self, user_client, posts,
+                                   django_assert_num_queries, kind, method,
+                                   target, data, expected_queries):
+        title, _, review, comment = posts
+        url = self.get_url(kind, target, title, review, comment)
+        request = getattr(user_client, method)
+        with django_assert_num_queries(expected_queries):
+            response = request(url, data=data) if data else request(url)
+        assert response.status_code < HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что {method.upper()}-запрос к `{url}` выполняется '
+            'успешно.'
+        )
+
+    def test_02_parent_chain_is_checked(self, user_client, posts):
+        title, other_title, review, comment = posts
+        for kind, target in (
+            ('reviews', 'detail'), ('comments', 'list'), ('comments', 'detail')
+        ):
+            url = self.get_url(kind, target, other_title, review, comment)
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с объектом другого '
+                'произведения возвращает ответ со статусом 404.'
+            )
+        url = self.get_url('comments', 'list', other_title, review, comment)
+        response = user_client.post(url, data={'text': 'Ответ'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_authors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CommentsCount:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def review(self, user):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        return Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+
+    def get_count(self, client, review):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        response = client.get(f'{url}{review.id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['comments_count']
+
+    def test_01_count_follows_comments(self, user_client, review):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        assert self.get_count(user_client, review) == 0
+
+        ids = [
+            user_client.post(url, data={'text': f'Ответ {idx}'}).json()['id']
+            for idx in range(3)
+        ]
+        assert self.get_count(user_client, review) == 3, (
+            'Проверьте, что ответ со списком отзывов и отдельным отзывом '
+            'содержит поле `comments_count` с числом комментариев.'
+        )
+
+        user_client.patch(f'{url}{ids[0]}/', data={'text': 'Исправлено'})
+        user_client.delete(f'{url}{ids[1]}/')
+        assert self.get_count(user_client, review) == 2, (
+            'Проверьте, что `comments_count` уменьшается при удалении '
+            'комментария и не меняется при его редактировании.'
+        )
+
+    def test_02_review_save_keeps_count(self, user, user_client, review):
+        from reviews.models import Comment, Review
+
+        stale = Review.objects.get(pk=review.pk)
+        Comment.objects.create(review=review, author=user, text='Ответ')
+        stale.text = 'Изменённый отзыв'
+        stale.save()
+
+        review.refresh_from_db()
+        assert review.comments_count == 1, (
+            'Проверьте, что сохранение отзыва не перезаписывает счётчик '
+            'комментариев устаревшим значением.'
+        )
+
+    def test_03_list_queries_do_not_depend_on_comments(
+            self, client, django_user_model, review,
+            django_assert_max_num_queries):
+        from reviews.models import Comment
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        with django_assert_max_num_queries(3) as context:
+            client.get(url)
+        queries = len(context.captured_queries)
+
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Ответ')
+            for author in create_authors(django_user_model, 20)
+        )
+        call_command('rebuild_ratings')
+        with django_assert_max_num_queries(queries):
+            data = client.get(url).json()
+        assert data['results'][0]['comments_count'] == 20, (
+            'Проверьте, что `comments_count` берётся из сохранённого '
+            'счётчика без дополнительных запросов к комментариям, а '
+            'команда `rebuild_ratings` пересчитывает его.'
+        )
+
+    def test_04_deferred_save_writes_loaded_fields(self, review):
+        from reviews.models import Title
+
+        title = Title.objects.only('id', 'name').get(pk=review.title_id)
+        title.name = 'Терминатор 2'
+        with CaptureQueriesContext(connection) as context:
+            title.save()
+        queries = [query['sql'] for query in context.captured_queries]
+        # Индекс подсказок догружает год одним запросом после UPDATE.
+        assert len(queries) == 2 and queries[0].startswith('UPDATE'), (
+            'Проверьте, что save() объекта с отложенными полями не '
+            'догружает их отдельными запросами.'
+        )
+        assert '"year"' not in queries[0], (
+            'Проверьте, что save() объекта с отложенными полями сохраняет '
+            'только загруженные поля.'
+        )
+        title.refresh_from_db()
+        assert (title.name, title.year) == ('Терминатор 2', 1984)
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_authors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ScoreDistribution:
+
+    DISTRIBUTION_URL_TEMPLATE = '/api/v1/titles/{title_id}/score-distribution/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Терминатор', year=1984)
+
+    def get_counts(self, client, title):
+        response = client.get(
+            self.DISTRIBUTION_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['score'] for item in data['scores']] == list(
+            range(1, 11)
+        )
+        return data['count'], {
+            item['score']: item['count']
+            for item in data['scores'] if item['count']
+        }
+
+    def test_01_distribution_follows_reviews(self, client, user_client,
+                                             moderator_client, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        assert self.get_counts(client, title) == (0, {})
+
+        review_id = user_client.post(
+            url, data={'text': 'Отзыв', 'score': 7}
+        ).json()['id']
+        moderator_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert self.get_counts(client, title) == (2, {7: 2}), (
+            f'Проверьте, что `{self.DISTRIBUTION_URL_TEMPLATE}` возвращает '
+            'число отзывов с каждой оценкой от 1 до 10.'
+        )
+
+        user_client.patch(f'{url}{review_id}/', data={'score': 3})
+        assert self.get_counts(client, title) == (2, {3: 1, 7: 1}), (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        user_client.delete(f'{url}{review_id}/')
+        assert self.get_counts(client, title) == (1, {7: 1}), (
+            'Проверьте, что распределение оценок обновляется при удалении '
+            'отзыва.'
+        )
+
+    def test_02_distribution_queries_and_not_found(
+            self, client, user, title, django_assert_num_queries):
+        from reviews.models import Review
+
+        Review.objects.create(title=title, author=user, text='Отзыв', score=9)
+        url = self.DISTRIBUTION_URL_TEMPLATE.format(title_id=title.id)
+        with django_assert_num_queries(2):
+            client.get(url)
+
+        response = client.get(
+            self.DISTRIBUTION_URL_TEMPLATE.format(title_id=title.id + 100)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для несуществующего произведения '
+            f'`{self.DISTRIBUTION_URL_TEMPLATE}` возвращает статус 404.'
+        )
+
+    def test_03_rebuild_after_bulk_import(self, client, django_user_model,
+                                          title):
+        from reviews.models import Review, TitleScore
+
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=score)
+            for author, score in zip(
+                create_authors(django_user_model, 5), (1, 1, 5, 10, 10)
+            )
+        )
+        TitleScore.objects.create(title=title, score=4, count=3)
+
+        call_command('rebuild_ratings')
+        assert self.get_counts(client, title) == (5, {1: 2, 5: 1, 10: 2}), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'распределения оценок после массовой загрузки отзывов.'
+        )
+
+    def test_04_stale_instance_save(self, client, user, title):
+        from reviews.models import Review, Title
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        stale = Review.objects.get(pk=review.pk)
+        review.score = 9
+        review.save()
+        stale.score = 7
+        stale.save()
+
+        assert self.get_counts(client, title) == (1, {7: 1}), (
+            'Проверьте, что при сохранении отзыва, загруженного до '
+            'изменения его оценки, распределение считается от оценки, '
+            'сохранённой в базе.'
+        )
+        title = Title.objects.get(pk=title.pk)
+        assert (title.rating_sum, title.rating_count) == (7, 1)
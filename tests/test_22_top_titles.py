@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_authors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TopTitles:
+
+    TOP_URL = '/api/v1/titles/top/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        from reviews.models import Category, Genre, Review, Title
+
+        authors = create_authors(django_user_model, 6)
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        titles = {
+            name: Title.objects.create(name=name, year=2000, category=movie)
+            for name in ('Один отзыв', 'Много отзывов', 'Средний', 'Пусто')
+        }
+        titles['Средний'].category = None
+        titles['Средний'].save()
+        titles['Много отзывов'].genre.set([drama])
+        scores = {
+            'Один отзыв': (10,),
+            'Много отзывов': (9, 9, 10, 9, 9, 10),
+            'Средний': (5, 6),
+        }
+        for name, title_scores in scores.items():
+            for author, score in zip(authors, title_scores):
+                Review.objects.create(
+                    title=titles[name], author=author, text='Отзыв',
+                    score=score
+                )
+        return titles
+
+    def get_names(self, client, **params):
+        response = client.get(self.TOP_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()]
+
+    def test_01_top_uses_weighted_rating(self, client, catalog):
+        assert self.get_names(client) == [
+            'Много отзывов', 'Один отзыв', 'Средний'
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` упорядочивает произведения '
+            'по байесовскому рейтингу: одна высокая оценка не ставит '
+            'произведение выше многих высоких, а произведения без отзывов '
+            'не выводятся.'
+        )
+        assert self.get_names(client, limit=1) == ['Много отзывов']
+        assert self.get_names(client, genre='drama') == ['Много отзывов']
+        assert self.get_names(client, category='movie') == [
+            'Много отзывов', 'Один отзыв'
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` поддерживает фильтры по жанру '
+            'и категории и параметр `limit`.'
+        )
+
+    def test_02_top_follows_reviews(self, client, user_client,
+                                    moderator_client, admin_client, catalog):
+        url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=catalog['Средний'].id
+        )
+        for author_client in (user_client, moderator_client, admin_client):
+            author_client.post(url, data={'text': 'Шедевр', 'score': 10})
+        assert self.get_names(client)[1:] == ['Средний', 'Один отзыв'], (
+            'Проверьте, что взвешенный рейтинг пересчитывается при '
+            'добавлении отзыва.'
+        )
+
+    def test_03_rebuild_and_query_plan(self, catalog):
+        from reviews.models import Title
+
+        Title.objects.update(weighted_rating=0)
+        call_command('rebuild_ratings')
+        ranked = Title.objects.filter(rating_count__gt=0).order_by(
+            '-weighted_rating', '-id'
+        )
+        assert [title.name for title in ranked] == [
+            'Много отзывов', 'Один отзыв', 'Средний'
+        ], (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'взвешенный рейтинг всех произведений.'
+        )
+        plan = ranked.all()[:10].explain()
+        assert 'title_weighted_rating_idx' in plan, (
+            'Проверьте, что выборка лучших произведений читает индекс '
+            '`title_weighted_rating_idx`, а не сортирует все произведения.'
+        )
+        assert 'TEMP B-TREE' not in plan
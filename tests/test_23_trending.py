@@ -0,0 +1,117 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tests.utils import create_authors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Trending:
+
+    TRENDING_URL = '/api/v1/titles/trending/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        from reviews.models import Category, Review, Title
+
+        authors = create_authors(django_user_model, 3)
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        fresh = Title.objects.create(name='Новинка', year=2024)
+        classic = Title.objects.create(
+            name='Классика', year=1960, category=movie
+        )
+        for author in authors:
+            Review.objects.create(
+                title=classic, author=author, text='Отзыв', score=8
+            )
+        Review.objects.create(
+            title=fresh, author=authors[0], text='Отзыв', score=9
+        )
+        # Отзывы на классику оставлены три дня назад.
+        Review.objects.filter(title=classic).update(
+            pub_date=timezone.now() - timedelta(days=3)
+        )
+        call_command('rebuild_ratings')
+        return fresh, classic
+
+    def get_trending(self, client, **params):
+        response = client.get(self.TRENDING_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (title['name'], title['recent_reviews'])
+            for title in response.json()
+        ]
+
+    def test_01_trending_windows_and_filters(self, client, catalog):
+        assert self.get_trending(client) == [('Новинка', 1)], (
+            f'Проверьте, что `{self.TRENDING_URL}` по умолчанию учитывает '
+            'отзывы за последние 24 часа.'
+        )
+        assert self.get_trending(client, window='7d') == [
+            ('Классика', 3), ('Новинка', 1)
+        ], (
+            f'Проверьте, что `{self.TRENDING_URL}?window=7d` упорядочивает '
+            'произведения по числу отзывов за неделю.'
+        )
+        assert self.get_trending(client, window='7d', category='movie') == [
+            ('Классика', 3)
+        ]
+        assert self.get_trending(client, window='7d', limit=1) == [
+            ('Классика', 3)
+        ]
+        response = client.get(self.TRENDING_URL, {'window': '1y'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что для неизвестного окна возвращается статус 400.'
+        )
+
+    def test_02_trending_follows_reviews(self, client, user_client,
+                                         catalog):
+        fresh, classic = catalog
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=classic.id)
+        review_id = user_client.post(
+            url, data={'text': 'Пересмотрел', 'score': 10}
+        ).json()['id']
+        assert self.get_trending(client) == [
+            ('Классика', 1), ('Новинка', 1)
+        ], (
+            'Проверьте, что новый отзыв сразу учитывается в популярности.'
+        )
+
+        user_client.delete(f'{url}{review_id}/')
+        assert self.get_trending(client) == [('Новинка', 1)]
+
+    def test_03_trending_does_not_read_reviews(self, client, catalog):
+        with CaptureQueriesContext(connection) as context:
+            self.get_trending(client, window='7d')
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что `{self.TRENDING_URL}` читает часовые счётчики, '
+            'а не таблицу отзывов.'
+        )
+
+    def test_04_compact_activity(self, catalog):
+        from reviews.models import TitleActivity
+
+        fresh, classic = catalog
+        old = (timezone.now() - timedelta(days=30)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        TitleActivity.objects.create(title=fresh, bucket=old, count=5)
+        TitleActivity.objects.create(
+            title=classic, bucket=old + timedelta(days=29), count=0
+        )
+        call_command('compact_activity')
+        assert sorted(
+            TitleActivity.objects.values_list('title_id', 'count')
+        ) == sorted([(fresh.id, 1), (classic.id, 3)]), (
+            'Проверьте, что команда `compact_activity` удаляет счётчики '
+            'старше самого длинного окна и пустые счётчики.'
+        )
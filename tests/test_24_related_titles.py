@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24RelatedTitles:
+
+    RELATED_URL_TEMPLATE = '/api/v1/titles/{title_id}/related/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def catalog(self):
+        from reviews.models import Category, Genre, Title
+
+        genres = {
+            slug: Genre.objects.create(name=slug.title(), slug=slug)
+            for slug in ('drama', 'action', 'comedy')
+        }
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        book = Category.objects.create(name='Книга', slug='book')
+        titles = {}
+        for name, title_genres, category in (
+            ('Первый', ('drama', 'action'), movie),
+            ('Второй', ('drama', 'action'), movie),
+            ('Третий', ('drama',), book),
+            ('Четвёртый', ('comedy',), None),
+            ('Пятый', (), None),
+        ):
+            titles[name] = Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            titles[name].genre.set(genres[slug] for slug in title_genres)
+        call_command('build_related_titles')
+        return titles
+
+    def get_related(self, client, title):
+        response = client.get(
+            self.RELATED_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (item['name'], item['similarity']) for item in response.json()
+        ]
+
+    def test_01_related_by_genres_and_category(self, client, catalog):
+        assert self.get_related(client, catalog['Первый']) == [
+            ('Второй', 1.0), ('Третий', 0.25)
+        ], (
+            f'Проверьте, что `{self.RELATED_URL_TEMPLATE}` возвращает '
+            'произведения с общими жанрами или категорией по убыванию '
+            'коэффициента Жаккара.'
+        )
+        assert self.get_related(client, catalog['Четвёртый']) == []
+        assert self.get_related(client, catalog['Пятый']) == []
+
+        response = client.get(self.RELATED_URL_TEMPLATE.format(
+            title_id=catalog['Пятый'].id + 100
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_incremental_rebuild(self, client, admin_client, catalog):
+        from reviews.related import rebuild_related_titles
+
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=catalog['Третий'].id
+        )
+        admin_client.patch(url, data={'genre': ['drama', 'action']})
+        assert rebuild_related_titles() == 3, (
+            'Проверьте, что пересчёт затрагивает только изменённое '
+            'произведение и произведения с общими признаками.'
+        )
+        assert rebuild_related_titles() == 0
+        assert self.get_related(client, catalog['Первый']) == [
+            ('Второй', 1.0), ('Третий', 0.5)
+        ], (
+            'Проверьте, что похожие произведения пересчитываются после '
+            'изменения жанров.'
+        )
+
+        admin_client.delete(self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=catalog['Второй'].id
+        ))
+        call_command('build_related_titles')
+        assert self.get_related(client, catalog['Первый']) == [
+            ('Третий', 0.5)
+        ], (
+            'Проверьте, что удалённое произведение пропадает из списков '
+            'похожих и не оставляет в них пустых мест.'
+        )
+
+    def test_03_category_and_bulk_changes_mark_titles(self, admin_client,
+                                                      catalog):
+        from reviews.models import Title
+
+        first, fourth = catalog['Первый'], catalog['Четвёртый']
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=first.id),
+            data={'category': 'book'}
+        )
+        admin_client.post('/api/v1/titles/bulk/', data=[
+            {'id': fourth.id, 'genre': ['drama']},
+            {'id': catalog['Пятый'].id, 'description': 'Без изменений'},
+        ], format='json')
+        assert set(Title.objects.filter(related_stale=True).values_list(
+            'name', flat=True
+        )) == {'Первый', 'Четвёртый'}, (
+            'Проверьте, что смена категории и жанров, в том числе через '
+            'массовую запись, помечает произведения для пересчёта похожих.'
+        )
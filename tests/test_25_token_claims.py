@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def get_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def count_user_queries(context):
+    return sum(
+        'users_customuser' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TokenClaims:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+    ME_URL = '/api/v1/users/me/'
+
+    def test_01_no_user_queries(self, user_client):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert count_user_queries(context) == 0, (
+            'Проверьте, что пользователь с токеном, содержащим его данные, '
+            'не загружается из базы на каждый запрос.'
+        )
+
+    def test_02_token_without_claims(self, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        client = get_client(AccessToken.for_user(user))
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert count_user_queries(context) == 1, (
+            'Проверьте, что токены без данных пользователя по-прежнему '
+            'принимаются, а пользователь загружается из базы.'
+        )
+
+    def test_03_role_changes_apply_to_issued_tokens(self, admin_client,
+                                                    user_client,
+                                                    user_superuser_client):
+        data = {'name': 'Фильм', 'slug': 'movie'}
+        assert user_client.post(self.CATEGORIES_URL, data=data).status_code \
+            == HTTPStatus.FORBIDDEN
+
+        user_superuser_client.patch(
+            f'{self.USERS_URL}TestUser/', data={'role': 'admin'}
+        )
+        user_superuser_client.patch(
+            f'{self.USERS_URL}TestAdmin/', data={'role': 'user'}
+        )
+        assert user_client.post(self.CATEGORIES_URL, data=data).status_code \
+            == HTTPStatus.CREATED, (
+                'Проверьте, что повышение роли действует для уже выданного '
+                'токена.'
+            )
+        data = {'name': 'Книга', 'slug': 'book'}
+        assert admin_client.post(self.CATEGORIES_URL, data=data).status_code \
+            == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что понижение роли действует для уже выданного '
+                'токена: данные в токене сверяются с текущими.'
+            )
+
+    def test_04_inactive_and_deleted_users(self, user, user_client, admin,
+                                           admin_client):
+        user.is_active = False
+        user.save()
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токен заблокированного пользователя не действует.'
+
+        admin.delete()
+        assert admin_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токен удалённого пользователя не действует.'
+
+    def test_05_profile_uses_full_user(self, user, user_client):
+        response = user_client.patch(self.ME_URL, data={'first_name': 'Имя'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        user.refresh_from_db()
+        assert (user.first_name, user.bio) == ('Имя', 'user bio'), (
+            f'Проверьте, что `{self.ME_URL}` работает с полным профилем '
+            'пользователя, а не только с данными из токена.'
+        )
+
+    def test_06_issued_token_carries_claims(self, client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user.confirmation_code = 'code'
+        user.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': 'code'
+        })
+        token = AccessToken(response.json()['token'])
+        assert token['user_claims'] == [user.username, 'user', False, True], (
+            'Проверьте, что `/api/v1/auth/token/` записывает в токен '
+            'данные пользователя, от которых зависят права.'
+        )
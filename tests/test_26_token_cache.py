@@ -0,0 +1,84 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+
+def get_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TokenCache:
+
+    ME_URL = '/api/v1/users/me/'
+
+    @pytest.fixture
+    def token_cache(self):
+        from users.authentication import ClaimsJWTAuthentication
+
+        token_cache = ClaimsJWTAuthentication.token_cache
+        token_cache.clear()
+        yield token_cache
+        token_cache.clear()
+
+    def test_01_repeat_token_is_cached(self, user, token_cache):
+        from users.tokens import UserAccessToken
+
+        client = get_client(UserAccessToken.for_user(user))
+        for _ in range(3):
+            assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+        assert (token_cache.hits, token_cache.misses) == (2, 1), (
+            'Проверьте, что повторный запрос с тем же токеном берёт '
+            'проверенный токен из кеша.'
+        )
+        assert get_client('invalid').get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert len(token_cache.entries) == 1, (
+            'Проверьте, что неверные токены не попадают в кеш.'
+        )
+
+    def test_02_entry_expires_with_token(self, user, token_cache):
+        from users.tokens import UserAccessToken
+
+        token = UserAccessToken.for_user(user)
+        token.set_exp(lifetime=timedelta(seconds=60))
+        client = get_client(token)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+
+        later = token.current_time + timedelta(seconds=61)
+        with mock.patch('users.authentication.time') as clock, \
+                mock.patch('rest_framework_simplejwt.tokens.aware_utcnow',
+                           return_value=later):
+            clock.time.return_value = later.timestamp()
+            response = client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что запись кеша действует не дольше срока действия '
+            'самого токена.'
+        )
+        assert token_cache.hits == 0
+
+    def test_03_least_recently_used_is_evicted(self, user, admin,
+                                               moderator):
+        from users.authentication import TokenCache
+        from users.tokens import UserAccessToken
+
+        token_cache = TokenCache(2)
+        tokens = [UserAccessToken.for_user(obj)
+                  for obj in (user, admin, moderator)]
+        token_cache.set('user', tokens[0])
+        token_cache.set('admin', tokens[1])
+        assert token_cache.get('user') is tokens[0]
+        token_cache.set('moderator', tokens[2])
+        assert token_cache.get('admin') is None, (
+            'Проверьте, что при переполнении кеша вытесняется токен, '
+            'к которому дольше всего не обращались.'
+        )
+        assert token_cache.get('user') is tokens[0]
+        assert token_cache.get('moderator') is tokens[2]
+        assert (token_cache.hits, token_cache.misses) == (3, 1)
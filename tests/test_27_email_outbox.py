@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+class FlakyBackend(EmailBackend):
+    '''Почта, которая не принимает письма на адреса из failing.'''
+
+    failing = set()
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if set(messages[0].to) & self.failing:
+            raise ConnectionError('Соединение сброшено')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, number):
+        return client.post(self.URL_SIGNUP, data={
+            'email': f'user{number}@yamdb.fake',
+            'username': f'user{number}',
+        })
+
+    def test_01_signup_only_queues_email(self, client):
+        from users.models import OutgoingEmail
+
+        with CaptureQueriesContext(connection) as context:
+            self.signup(client, 1)
+        inserts = [
+            query['sql'] for query in context.captured_queries
+            if 'users_outgoingemail' in query['sql']
+        ]
+        assert len(inserts) == 1 and inserts[0].startswith('INSERT'), (
+            f'Проверьте, что `{self.URL_SIGNUP}` только сохраняет письмо '
+            'в очередь одним запросом.'
+        )
+        assert mail.outbox == [], (
+            f'Проверьте, что `{self.URL_SIGNUP}` не отправляет письмо во '
+            'время запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'user1@yamdb.fake'
+
+        call_command('send_emails')
+        assert [message.to for message in mail.outbox] == [
+            ['user1@yamdb.fake']
+        ]
+        assert 'Ваш код подтверждения' in mail.outbox[0].body
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_batches_share_connection(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_27_email_outbox.FlakyBackend'
+        FlakyBackend.opened = 0
+        for number in range(5):
+            self.signup(client, number)
+        call_command('send_emails', batch_size=2)
+        assert len(mail.outbox) == 5
+        assert FlakyBackend.opened == 3, (
+            'Проверьте, что команда `send_emails` отправляет каждую пачку '
+            'писем через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_27_email_outbox.FlakyBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 3
+        FlakyBackend.failing = {'user1@yamdb.fake'}
+        self.signup(client, 1)
+        self.signup(client, 2)
+        try:
+            call_command('send_emails')
+            assert [message.to for message in mail.outbox] == [
+                ['user2@yamdb.fake']
+            ], (
+                'Проверьте, что ошибка отправки одного письма не мешает '
+                'отправить остальные.'
+            )
+            email = OutgoingEmail.objects.get()
+            delay = email.next_attempt - timezone.now()
+            assert email.attempts == 1 and 'ConnectionError' in (
+                email.last_error
+            )
+            assert timedelta(seconds=50) < delay <= timedelta(seconds=60), (
+                'Проверьте, что неотправленное письмо получает новую '
+                'попытку через EMAIL_OUTBOX_RETRY_DELAY секунд.'
+            )
+
+            for attempts, seconds in ((2, 120), (3, None)):
+                later = email.next_attempt + timedelta(seconds=1)
+                with mock.patch('users.utils.timezone.now',
+                                return_value=later):
+                    call_command('send_emails')
+                email.refresh_from_db()
+                assert email.attempts == attempts
+                if seconds is None:
+                    assert email.next_attempt is None, (
+                        'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS '
+                        'попыток письмо больше не отправляется.'
+                    )
+                else:
+                    assert email.next_attempt - later == timedelta(
+                        seconds=seconds
+                    ), 'Проверьте, что пауза между попытками удваивается.'
+        finally:
+            FlakyBackend.failing = set()
+        assert len(mail.outbox) == 1
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Регистрация: выборка пользователей по username и email, BEGIN,
+# вставка или обновление пользователя и вставка письма в очередь.
+SIGNUP_QUERIES = 4
+# Отказ при занятом username или email: только выборка.
+SIGNUP_CONFLICT_QUERIES = 1
+# Выпуск токена: одна выборка пользователя для проверки кода и токена.
+TOKEN_QUERIES = 1
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28AuthQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def post(self, client, url, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data=data)
+        return response, len(context.captured_queries)
+
+    def test_01_signup_new_user(self, client, django_user_model):
+        data = {'username': 'new_user', 'email': 'new@yamdb.fake'}
+        response, queries = self.post(client, self.URL_SIGNUP, data)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == data
+        assert queries == SIGNUP_QUERIES, (
+            'Проверьте, что регистрация нового пользователя через '
+            f'`{self.URL_SIGNUP}` выполняет {SIGNUP_QUERIES} запроса к базе, '
+            f'а не {queries}.'
+        )
+        assert django_user_model.objects.get(
+            username='new_user'
+        ).confirmation_code
+
+    def test_02_signup_existing_user(self, client, user):
+        old_code = user.confirmation_code
+        data = {'username': user.username, 'email': user.email}
+        response, queries = self.post(client, self.URL_SIGNUP, data)
+        assert response.status_code == HTTPStatus.OK
+        assert queries == SIGNUP_QUERIES, (
+            f'Проверьте, что повторный запрос кода через `{self.URL_SIGNUP}` '
+            f'выполняет {SIGNUP_QUERIES} запроса к базе, а не {queries}.'
+        )
+        user.refresh_from_db()
+        assert user.confirmation_code != old_code
+        assert user.bio == 'user bio', (
+            'Проверьте, что повторная регистрация меняет только код '
+            'подтверждения.'
+        )
+
+    def test_03_signup_mismatched_email(self, client, user, admin):
+        for data, fields in (
+            ({'username': user.username, 'email': 'other@yamdb.fake'},
+             {'username'}),
+            ({'username': 'other', 'email': user.email}, {'email'}),
+            ({'username': user.username, 'email': admin.email},
+             {'username', 'email'}),
+        ):
+            response, queries = self.post(client, self.URL_SIGNUP, data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert set(response.json()) == fields, (
+                'Проверьте, что при занятом username или email ответ '
+                'указывает на занятые поля.'
+            )
+            assert queries == SIGNUP_CONFLICT_QUERIES, (
+                'Проверьте, что занятые username и email проверяются одним '
+                f'запросом к базе, а не {queries}.'
+            )
+
+    def test_04_token_single_user_fetch(self, client, user):
+        user.confirmation_code = 'code'
+        user.save()
+        for code, status in (('wrong', HTTPStatus.BAD_REQUEST),
+                             ('code', HTTPStatus.OK)):
+            response, queries = self.post(client, self.URL_TOKEN, {
+                'username': user.username, 'confirmation_code': code
+            })
+            assert response.status_code == status
+            assert queries == TOKEN_QUERIES, (
+                f'Проверьте, что `{self.URL_TOKEN}` загружает пользователя '
+                'один раз и для проверки кода, и для выпуска токена.'
+            )
+        assert 'token' in response.json()
+
+        response, queries = self.post(client, self.URL_TOKEN, {
+            'username': 'missing', 'confirmation_code': 'code'
+        })
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert queries == TOKEN_QUERIES
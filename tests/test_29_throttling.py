@@ -0,0 +1,132 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def rates(self, settings):
+        # Суточные окна: граница окна не попадёт между запросами теста.
+        settings.THROTTLE_RATES = {
+            'auth_ip': '4/day',
+            'signup_identity': '2/day',
+            'token_identity': '3/day',
+            'posts': '2/day',
+        }
+        return settings.THROTTLE_RATES
+
+    def signup(self, client, number, ip='10.0.0.1'):
+        return client.post(self.URL_SIGNUP, data={
+            'email': 'same@yamdb.fake', 'username': f'user{number}'
+        }, REMOTE_ADDR=ip)
+
+    def test_01_signup_throttled_by_identity_and_ip(self, client, rates):
+        statuses = [
+            self.signup(client, 1, ip=f'10.0.0.{number}').status_code
+            for number in range(3)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_SIGNUP}` ограничивает число писем '
+            'на один адрес, с какого бы IP ни приходили запросы.'
+        )
+
+        for number in range(4):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': f'other{number}@yamdb.fake',
+                'username': f'other{number}'
+            }, REMOTE_ADDR='10.0.1.1')
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'other9@yamdb.fake', 'username': 'other9'
+        }, REMOTE_ADDR='10.0.1.1')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_SIGNUP}` ограничивает число '
+            'запросов с одного IP.'
+        )
+        assert 0 < int(response['Retry-After']) <= 24 * 60 * 60
+
+    def test_02_confirmation_code_bruteforce(self, client, user, rates):
+        for number in range(3):
+            response = client.post(self.URL_TOKEN, data={
+                'username': user.username, 'confirmation_code': 'wrong'
+            }, REMOTE_ADDR=f'10.0.0.{number}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': 'wrong'
+        }, REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_TOKEN}` ограничивает число попыток '
+            'ввести код подтверждения одного пользователя.'
+        )
+
+    def test_03_posts_throttled_per_user(self, admin, user_client,
+                                         moderator_client, rates):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        )
+        for _ in range(2):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+            assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что число новых комментариев одного пользователя '
+            'ограничено.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение касается только POST-запросов.'
+        )
+        response = moderator_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что ограничение считается для каждого пользователя '
+            'отдельно.'
+        )
+
+    def test_04_sliding_window(self, rates):
+        from django.core.cache import cache
+
+        from api.throttling import AuthIPThrottle
+
+        rates['auth_ip'] = '4/min'
+        request = APIRequestFactory().post('/', REMOTE_ADDR='10.0.0.1')
+
+        def allowed(now):
+            throttle = AuthIPThrottle()
+            with mock.patch.object(throttle, 'timer', return_value=now):
+                return throttle.allow_request(request, None), throttle
+
+        # Четыре запроса в конце одного окна.
+        assert all(allowed(6000 + 59)[0] for _ in range(4))
+        result, throttle = allowed(6000 + 59)
+        assert not result
+        assert throttle.wait() == pytest.approx(1)
+        # Через 15 секунд в следующем окне предыдущее учитывается
+        # на три четверти: оценка 3, пропускается один запрос.
+        assert allowed(6060 + 15)[0]
+        assert not allowed(6060 + 15)[0], (
+            'Проверьте, что предыдущее окно учитывается с долей, которую '
+            'оно занимает в скользящем окне.'
+        )
+        assert allowed(6060 + 30)[0]
+        assert [
+            cache.get(f'throttle:auth_ip:10.0.0.1:{window}')
+            for window in (100, 101)
+        ] == [4, 2], (
+            'Проверьте, что для ограничения хранится по одному счётчику '
+            'на окно, а не список отметок времени.'
+        )